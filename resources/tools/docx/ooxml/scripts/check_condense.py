@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Check that pack's streaming condenser gives the same output as the minidom one.
+
+_condense_xml_stream must produce byte for byte what _condense_xml_dom produces.
+This compares the two on a set of edge cases, on the XML templates the Document
+library copies into documents, on fixed-seed random documents, and on the XML
+parts of any Office files or unpacked directories given. Both condensers must
+also give the exact golden outputs below, whose escaping comes from pack's
+XML_ESCAPES table rather than from the running minidom version. It exits with
+status 1 if any output differs.
+
+Example usage:
+    python check_condense.py [<office_file_or_directory> ...] [--random N]
+"""
+
+import argparse
+import io
+import random
+import sys
+import zipfile
+from pathlib import Path
+
+from pack import XML_ESCAPES, _condense_xml_dom, _condense_xml_stream, _is_xml_part
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+# Inputs where the streaming condenser has to copy a minidom quirk
+EDGE_CASES = {
+    "nbsp-only text": f"<w:p {W}><w:r>&#160;</w:r><w:t>&#160;</w:t></w:p>",
+    "whitespace-only text": f"<w:p {W}>\n  <w:r> <w:t> </w:t>\t</w:r>\r\n</w:p>",
+    "character references": f"<w:p {W}><w:r>&#32;&#x9;&#10;</w:r>x&#13;y</w:p>",
+    "comment in *:t": f"<w:p {W}><w:t>a<!-- c -->b</w:t><w:t><!----></w:t></w:p>",
+    "comment elsewhere": f"<!--top--><w:p {W}><!--a--><w:r/><!--b--></w:p><!--end-->",
+    "empty CDATA": f"<w:p {W}><w:r><![CDATA[]]></w:r><w:t><![CDATA[]]></w:t></w:p>",
+    "CDATA content": f"<w:p {W}><w:r><![CDATA[ ]]><![CDATA[x<y&]]></w:r></w:p>",
+    "text around CDATA": f"<w:p {W}><w:r> <![CDATA[ ]]> </w:r></w:p>",
+    "namespace order": (
+        '<w:p w:a="1" xmlns:w="urn:w" b="2" xmlns="urn:d" xmlns:x="urn:x" '
+        'x:c="3"><x:r xmlns:x="urn:x2" xmlns=""/></w:p>'
+    ),
+    "attribute escaping": (
+        f'<w:p {W} w:a="&amp;&quot;&lt;&gt;" w:b="x&#10;y&#9;z" w:c="a\nb"/>'
+    ),
+    "nested *:t": f"<w:t {W}> <w:r> <w:t> </w:t> </w:r> </w:t>",
+    "processing instructions": f'<?pi?><w:p {W}><?x y?> <w:r/> <?z?></w:p><?end d?>',
+    "declaration": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n<p/>',
+    "ascii declaration": '<?xml version="1.0" encoding="ascii"?><p>&#233;</p>',
+    "byte order mark": "﻿<p> <q>é中</q> </p>",
+    "DOCTYPE fallback": '<!DOCTYPE p [<!ENTITY e "x">]><p> <q>&e;</q> </p>',
+    "not well-formed": f"<w:p {W}><w:r></w:p>",
+    "truncated": f"<w:p {W}><w:r> <w:t>a",
+}
+
+DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+ESCAPED = "".join(reference for _, reference in XML_ESCAPES)
+
+# Inputs with the exact output both condensers must give
+GOLDEN = {
+    "escaping table": (
+        '<p a="&amp;&lt;&quot;&gt;">&amp;&lt;"&gt;</p>',
+        f'{DECLARATION}<p a="{ESCAPED}">{ESCAPED}</p>',
+    ),
+    "DOCTYPE escaping": (
+        '<!DOCTYPE p><p a="&quot;"> <q>"</q> </p>',
+        f'{DECLARATION}<!DOCTYPE p><p a="&quot;"><q>&quot;</q></p>',
+    ),
+    "whitespace and comments": (
+        '<p><q>&#160;</q><![CDATA[]]><w:t xmlns:w="urn:w"> <!--c--> </w:t></p>',
+        f'{DECLARATION}<p><q/><w:t xmlns:w="urn:w"> <!--c--> </w:t></p>',
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the streaming XML condenser with the minidom one"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Office files or unpacked directories whose XML parts are compared",
+    )
+    parser.add_argument(
+        "--random",
+        type=int,
+        default=2000,
+        help="Number of random documents to compare (default: 2000)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    cases = [(name, xml.encode("utf-8")) for name, xml in EDGE_CASES.items()]
+    templates = Path(__file__).resolve().parents[2] / "scripts" / "templates"
+    cases += [(f"template {f.name}", f.read_bytes()) for f in sorted(templates.glob("*.xml"))]
+    rng = random.Random(args.seed)
+    cases += [(f"random document {i}", _random_document(rng)) for i in range(args.random)]
+    for path in args.paths:
+        cases += _package_parts(Path(path))
+
+    failures = [name for name, data in cases if not _same_output(data)]
+    for name in failures:
+        print(f"FAILED - {name}: the condensers give different output")
+    for name, (xml, expected) in GOLDEN.items():
+        cases.append((f"golden {name}", xml))
+        wrong = [
+            condense.__name__
+            for condense in (_condense_xml_dom, _condense_stream)
+            if condense(xml.encode("utf-8")) != expected.encode("utf-8")
+        ]
+        if wrong:
+            failures.append(f"golden {name}")
+            print(f"FAILED - golden {name}: {', '.join(wrong)} differs from expected")
+    if failures:
+        print(f"{len(failures)} of {len(cases)} inputs differ")
+        sys.exit(1)
+    print(f"PASSED - {len(cases)} inputs condense the same way")
+
+
+def _package_parts(path):
+    """Return (name, bytes) for each XML part of an Office file or unpacked directory."""
+    if path.is_dir():
+        return [
+            (str(f), f.read_bytes())
+            for f in sorted(path.rglob("*"))
+            if f.is_file() and _is_xml_part(f)
+        ]
+    with zipfile.ZipFile(path) as zf:
+        return [
+            (f"{path}:{name}", zf.read(name))
+            for name in zf.namelist()
+            if _is_xml_part(Path(name))
+        ]
+
+
+def _condense_stream(data):
+    """Return the output of the streaming condenser for data."""
+    out = io.BytesIO()
+    _condense_xml_stream(io.BytesIO(data), out.write)
+    return out.getvalue()
+
+
+def _same_output(data):
+    """Check both condensers give the same bytes, or both reject the input."""
+    results = []
+    for condense in (_condense_xml_dom, _condense_stream):
+        try:
+            results.append(condense(data))
+        except Exception:
+            results.append(None)
+    return results[0] == results[1]
+
+
+def _random_document(rng):
+    """Return a random XML document mixing the constructs the condensers handle."""
+    spaces = [" ", "\n", "\t", "\r\n", "  \n  ", "&#32;", "&#x9;", "&#10;", "&#160;"]
+    words = ["a", "b c", "&amp;", "&lt;x&gt;", '"q"', "'", ">", "é", "中", "]]"]
+    namespaces = [("w", "urn:w"), ("a", "urn:a"), ("x", "urn:x")]
+
+    def text():
+        pool = spaces if rng.random() < 0.6 else words
+        return "".join(rng.choice(pool) for _ in range(rng.randint(1, 3)))
+
+    def node(depth, declared):
+        r = rng.random()
+        if r < 0.25:
+            return text()
+        if r < 0.32:
+            return "<!--" + rng.choice(["c", " ", "", "a-b", "é"]) + "-->"
+        if r < 0.36:
+            return "<?pi " + rng.choice(["", "d", "x y"]) + "?>"
+        if r < 0.42:
+            return "<![CDATA[" + rng.choice(["", " ", "x<y", "\n", "&amp;"]) + "]]>"
+        if depth > 4:
+            return text()
+        return element(depth + 1, declared)
+
+    def element(depth, declared):
+        declared = dict(declared)
+        attributes = []
+        if rng.random() < 0.3:
+            prefix, uri = rng.choice(namespaces)
+            attributes.append(f'xmlns:{prefix}="{uri}"')
+            declared[prefix] = uri
+        if rng.random() < 0.15:
+            attributes.append(rng.choice(['xmlns="urn:d"', 'xmlns=""']))
+        prefixes = list(declared)
+
+        def qualified(local, chance):
+            if rng.random() < chance:
+                return f"{rng.choice(prefixes)}:{local}"
+            return local
+
+        name = qualified(rng.choice(["t", "r", "p", "tt", "t2"]), 0.8)
+        for i in range(rng.randint(0, 2)):
+            value = rng.choice(["1", " a ", "&amp;&quot;&lt;", "x&#10;y", "a\nb", ">"])
+            attributes.insert(
+                rng.randint(0, len(attributes)), f'{qualified(f"at{i}", 0.4)}="{value}"'
+            )
+        if rng.random() < 0.3:
+            attributes.append('xml:space="preserve"')
+        children = "".join(node(depth, declared) for _ in range(rng.randint(0, 5)))
+        start = " ".join([name] + attributes)
+        if children or rng.random() < 0.5:
+            return f"<{start}>{children}</{name}>"
+        return f"<{start}/>"
+
+    head = rng.choice(
+        [
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+            '<?xml version="1.0"?>\r\n',
+            "﻿",
+            "",
+        ]
+    )
+    prolog = "".join(rng.choice(["", "<!--top-->", "\n", "<?p q?>"]) for _ in range(2))
+    root = element(0, {"w": "urn:w"})
+    end = root.index(">")
+    if root[end - 1] == "/":
+        end -= 1
+    split = root.find(" ", 0, end)
+    split = end if split == -1 else split
+    root = f'{root[:split]} xmlns:w="urn:w"{root[split:]}'
+    data = (head + prolog + root + rng.choice(["", "<!--end-->", "\n"])).encode("utf-8")
+    if rng.random() < 0.1:
+        data = data[: rng.randint(0, len(data))]
+    return data
+
+
+if __name__ == "__main__":
+    main()
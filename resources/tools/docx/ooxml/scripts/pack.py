@@ -3,17 +3,51 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N]
 """
 
 import argparse
-import shutil
+import asyncio
+import codecs
+import io
 import subprocess
 import sys
 import tempfile
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from xml.parsers import expat
+
+try:
+    from .workfiles import PENDING_PARTS_FILE, is_partial
+except ImportError:  # Run as a script rather than imported from ooxml.scripts
+    from workfiles import PENDING_PARTS_FILE, is_partial
+
+# Characters escaped in the text and attribute values of condensed parts, in
+# order. Both condensers use this table rather than minidom's escaping, which
+# changed in Python 3.13, so a part packs to the same bytes on every version
+XML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), ('"', "&quot;"), (">", "&gt;"))
+
+# Extensions of parts that are already compressed, stored in the zip as they are
+STORED_EXTENSIONS = {
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".m4a",
+    ".mp3",
+    ".mp4",
+    ".png",
+    ".wdp",
+    ".webp",
+}
+
+# LibreOffice export filter that validate_document converts each file type with
+CONVERSION_FILTERS = {
+    ".docx": "HTML",
+    ".pptx": "impress_html_Export",
+    ".xlsx": "HTML (StarCalc)",
+}
 
 
 def main():
@@ -21,11 +55,21 @@ def main():
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for condensing XML parts (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +86,17 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=1, soffice_pool=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of processes condensing XML parts; the zip members are
+            written in the same order whatever the number (default: 1)
+        soffice_pool: Optional SofficePool (see soffice.py) to validate with,
+            which can keep LibreOffice running between files
 
     Returns:
         bool: True if successful, False if validation failed
@@ -60,43 +108,112 @@ def pack_document(input_dir, output_file, validate=False):
         raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    files = [
+        f
+        for f in input_dir.rglob("*")
+        if f.is_file() and not is_partial(f) and f != input_dir / PENDING_PARTS_FILE
+    ]
+    xml_files = [f for f in files if _is_xml_part(f)]
+
+    # Create final Office file as zip archive, straight from the input directory
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        if jobs == 1 or len(xml_files) < 2:
+            for f in files:
+                _write_part(zf, f, f.relative_to(input_dir))
+        else:
+            # Condense XML parts in worker processes, in the order they are written
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                condensed = executor.map(
+                    _condense_part,
+                    xml_files,
+                    chunksize=max(1, len(xml_files) // (jobs * 4)),
+                )
+                for f in files:
+                    _write_part(
+                        zf,
+                        f,
+                        f.relative_to(input_dir),
+                        next(condensed) if _is_xml_part(f) else None,
+                    )
+
+    # Validate if requested
+    if validate:
+        if soffice_pool is not None:
+            valid = soffice_pool.validate(output_file)
+        else:
+            valid = validate_document(output_file)
+        if not valid:
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
+
+async def pack_document_async(input_dir, output_file, soffice_pool, jobs=1):
+    """Pack and validate a directory without blocking the event loop.
+
+    Packing runs in a thread and validation on one of the pool's workers, so
+    packing several documents with asyncio.gather overlaps their conversions.
+
+    Args:
+        input_dir: Path to unpacked Office document directory
+        output_file: Path to output Office file
+        soffice_pool: SofficePool (see soffice.py) to validate with
+        jobs: Number of processes condensing XML parts (default: 1)
 
+    Returns:
+        bool: True if successful, False if validation failed
+    """
+    await asyncio.to_thread(pack_document, input_dir, output_file, False, jobs)
+    if not await soffice_pool.validate_async(output_file):
+        Path(output_file).unlink()  # Delete the corrupt file
+        return False
     return True
 
 
+def _is_xml_part(part_file):
+    """Check whether a part is condensed when packed."""
+    return part_file.name.endswith((".xml", ".rels"))
+
+
+def _condense_part(part_file):
+    """Condense an XML part file and return the condensed bytes."""
+    condensed = io.BytesIO()
+    with open(part_file, "rb") as f:
+        _condense_xml_stream(f, condensed.write)
+    return condensed.getvalue()
+
+
+def _write_part(zf, part_file, arcname, condensed=None):
+    """Write one part into the zip, reading it once.
+
+    XML parts are condensed as they are streamed into the zip (see condense_xml),
+    unless their condensed bytes are passed in. Other parts are copied through
+    unchanged; already compressed ones (see STORED_EXTENSIONS) are stored instead
+    of being deflated again.
+    """
+    if _is_xml_part(part_file):
+        info = zipfile.ZipInfo.from_file(part_file, arcname)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        if condensed is not None:
+            zf.writestr(info, condensed)
+            return
+        with open(part_file, "rb") as src, zf.open(info, "w") as dest:
+            _condense_xml_stream(src, dest.write)
+    elif part_file.suffix.lower() in STORED_EXTENSIONS:
+        zf.write(part_file, arcname, compress_type=zipfile.ZIP_STORED)
+    else:
+        zf.write(part_file, arcname)
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
-    match doc_path.suffix.lower():
-        case ".docx":
-            filter_name = "html:HTML"
-        case ".pptx":
-            filter_name = "html:impress_html_Export"
-        case ".xlsx":
-            filter_name = "html:HTML (StarCalc)"
+    filter_name = f"html:{CONVERSION_FILTERS[doc_path.suffix.lower()]}"
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
@@ -132,8 +249,28 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(_condense_part(xml_file))
+
+
+def _condense_xml_stream(source, write):
+    """Condense an XML part read from a binary file, passing the output to write.
+
+    Gives the same output as _condense_xml_dom in a single streaming pass. Parts
+    with a DOCTYPE, which Office never writes, are condensed with
+    _condense_xml_dom instead.
+    """
+    condenser = _XMLCondenser(write)
+    try:
+        condenser.feed(source)
+    except _DoctypeDeclared:
+        source.seek(0)
+        write(_condense_xml_dom(source.read()))
+
+
+def _condense_xml_dom(data):
+    """Strip unnecessary whitespace and remove comments from an XML part's bytes."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
 
     # Process each element to remove whitespace and comments
     for element in dom.getElementsByTagName("*"):
@@ -150,9 +287,211 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return _serialize_dom(dom)
+
+
+def _serialize_dom(dom):
+    """Serialize a minidom document like toxml(encoding="UTF-8"), escaping with _escape."""
+    out = ['<?xml version="1.0" encoding="UTF-8"?>']
+
+    def write(node):
+        if node.nodeType == node.ELEMENT_NODE:
+            out.append(f"<{node.tagName}")
+            for name, value in node.attributes.items():
+                # minidom gives xmlns="" the value None
+                out.append(f' {name}="{_escape(value or "")}"')
+            if not node.childNodes:
+                out.append("/>")
+                return
+            out.append(">")
+            for child in node.childNodes:
+                write(child)
+            out.append(f"</{node.tagName}>")
+        elif node.nodeType == node.TEXT_NODE:
+            out.append(_escape(node.data))
+        elif node.nodeType == node.CDATA_SECTION_NODE:
+            out.append(f"<![CDATA[{node.data}]]>")
+        elif node.nodeType == node.COMMENT_NODE:
+            out.append(f"<!--{node.data}-->")
+        elif node.nodeType == node.PROCESSING_INSTRUCTION_NODE:
+            out.append(f"<?{node.target} {node.data}?>")
+        elif node.nodeType == node.DOCUMENT_TYPE_NODE:
+            out.append(f"<!DOCTYPE {node.name}")
+            if node.publicId:
+                out.append(f"  PUBLIC '{node.publicId}'  '{node.systemId}'")
+            elif node.systemId:
+                out.append(f"  SYSTEM '{node.systemId}'")
+            if node.internalSubset is not None:
+                out.append(f" [{node.internalSubset}]")
+            out.append(">")
+
+    for node in dom.childNodes:
+        write(node)
+    return "".join(out).encode("utf-8", "xmlcharrefreplace")
+
+
+def _escape(data):
+    """Escape text or an attribute value for condensed output (see XML_ESCAPES)."""
+    for char, reference in XML_ESCAPES:
+        if char in data:
+            data = data.replace(char, reference)
+    return data
+
+
+class _DoctypeDeclared(Exception):
+    """Raised by _XMLCondenser when a part declares a DOCTYPE."""
+
+
+class _XMLCondenser:
+    """
+    Streaming version of _condense_xml_dom on top of expat.
+
+    It builds the same text, CDATA and comment nodes as minidom, but writes each
+    one out as soon as it is complete instead of building a DOM. Whitespace-only
+    text nodes and comments are dropped from elements not named *:t, and an
+    element is written as <x/> when none of its children is left. Memory use is
+    bounded by the nesting depth and the size of the largest text node.
+
+    check_condense.py compares its output with _condense_xml_dom; run it after
+    changing either.
+    """
+
+    # Number of output pieces collected before they are passed on
+    FLUSH_PIECES = 4096
+
+    def __init__(self, write):
+        self.write = write
+        self.out = ['<?xml version="1.0" encoding="UTF-8"?>']
+        # Open elements: [qualified name, keep whitespace and comments, childless]
+        self.stack = []
+        self.namespaces = []
+        # Node being built in the current element: None, "text", "cdata" or "other"
+        self.last = None
+        self.chunks = []
+        self.in_cdata = False
+
+    def feed(self, source):
+        """Parse a binary file as UTF-8, whatever its XML declaration says."""
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.namespace_prefixes = True
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.specified_attributes = True
+        parser.StartDoctypeDeclHandler = self.start_doctype
+        parser.StartNamespaceDeclHandler = self.start_namespace
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.characters
+        parser.StartCdataSectionHandler = self.start_cdata
+        parser.EndCdataSectionHandler = self.end_cdata
+        parser.CommentHandler = self.comment
+        parser.ProcessingInstructionHandler = self.processing_instruction
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            parser.Parse(decoder.decode(chunk), False)
+        parser.Parse(decoder.decode(b"", final=True), True)
+        self.write("".join(self.out).encode("utf-8"))
+
+    @staticmethod
+    def qualified_name(name):
+        """Turn an expat "uri local prefix" name into the name as written."""
+        if " " not in name:
+            return name
+        parts = name.split(" ")
+        if len(parts) == 3:
+            return f"{parts[2]}:{parts[1]}"
+        if len(parts) == 2:
+            return parts[1]
+        raise ValueError(
+            f"Unsupported syntax: spaces in URIs not supported: {name!r}"
+        )
+
+    def open_parent(self):
+        """Close the start tag of the current element once it gets a child."""
+        if self.stack and self.stack[-1][2]:
+            self.stack[-1][2] = False
+            self.out.append(">")
+
+    def finish_node(self):
+        """Write out the text or CDATA node built so far, unless it is dropped."""
+        if self.last == "text":
+            text = "".join(self.chunks)
+            if self.stack[-1][1] or text.strip() != "":
+                self.open_parent()
+                self.out.append(_escape(text))
+        elif self.last == "cdata":
+            self.open_parent()
+            self.out.append(f"<![CDATA[{''.join(self.chunks)}]]>")
+        self.chunks = []
+
+    def add_other(self, markup):
+        self.finish_node()
+        self.open_parent()
+        self.out.append(markup)
+        self.last = "other"
+
+    def start_doctype(self, name, system_id, public_id, has_internal_subset):
+        raise _DoctypeDeclared(name)
+
+    def start_namespace(self, prefix, uri):
+        self.namespaces.append((prefix, uri))
+
+    def start_element(self, name, attributes):
+        self.finish_node()
+        self.open_parent()
+        qname = self.qualified_name(name)
+        self.out.append(f"<{qname}")
+        attrs = {}
+        for prefix, uri in self.namespaces:
+            attrs["xmlns:" + prefix if prefix else "xmlns"] = uri or ""
+        self.namespaces = []
+        for i in range(0, len(attributes), 2):
+            attrs[self.qualified_name(attributes[i])] = attributes[i + 1]
+        for attr_name, value in attrs.items():
+            self.out.append(f' {attr_name}="{_escape(value)}"')
+        self.stack.append([qname, qname.endswith(":t"), True])
+        self.last = None
+
+    def end_element(self, name):
+        self.finish_node()
+        qname, _, childless = self.stack.pop()
+        self.out.append("/>" if childless else f"</{qname}>")
+        self.last = "other"
+        if len(self.out) >= self.FLUSH_PIECES:
+            self.write("".join(self.out).encode("utf-8"))
+            self.out = []
+
+    def characters(self, data):
+        if self.in_cdata:
+            if self.last == "cdata" and self.cdata_continue:
+                self.chunks.append(data)
+                return
+            self.finish_node()
+            self.last = "cdata"
+            self.cdata_continue = True
+        elif self.last != "text":
+            self.finish_node()
+            self.last = "text"
+        self.chunks.append(data)
+
+    def start_cdata(self):
+        self.in_cdata = True
+        self.cdata_continue = False
+
+    def end_cdata(self):
+        self.in_cdata = False
+
+    def comment(self, data):
+        # Comments outside the root element and inside *:t elements are kept
+        if not self.stack or self.stack[-1][1]:
+            self.add_other(f"<!--{data}-->")
+        else:
+            self.finish_node()
+            self.last = "other"
+
+    def processing_instruction(self, target, data):
+        self.add_other(f"<?{target} {data}?>")
 
 
 if __name__ == "__main__":
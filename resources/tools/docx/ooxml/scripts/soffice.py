@@ -0,0 +1,357 @@
+"""
+Pool of workers for validating packed Office files, optionally kept warm.
+
+pack.validate_document starts a new soffice process for every file, and
+LibreOffice startup dominates the time each validation takes. SofficePool runs
+several validations at once and offers an async API, with the same contract as
+validate_document: the file is valid if LibreOffice converts it to HTML.
+
+By default each validation still calls validate_document. Passing
+worker_class=SofficeWorker instead keeps a few headless LibreOffice listeners
+running and sends each conversion to an idle one over UNO. That mode is opt-in
+because it has not been run against LibreOffice yet: the pool was only verified
+with LocalWorker, the stand-in for testing code that uses it, so conversions
+that time out or crash a listener are untested.
+
+Example usage:
+    from ooxml.scripts.pack import pack_document, pack_document_async
+    from ooxml.scripts.soffice import SofficePool, SofficeWorker
+
+    with SofficePool(workers=2) as pool:
+        pack_document("unpacked", "report.docx", validate=True, soffice_pool=pool)
+
+        # Overlap the packing and conversion of several documents
+        results = await asyncio.gather(
+            *(pack_document_async(d, f"{d}.docx", pool) for d in dirs)
+        )
+
+    # Warm LibreOffice listeners (untested against LibreOffice)
+    with SofficePool(workers=2, worker_class=SofficeWorker) as pool:
+        ...
+
+Without LibreOffice's Python bindings (uno) or soffice, SofficeWorker slots fall
+back to validate_document for each file.
+"""
+
+import asyncio
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import defusedxml.ElementTree
+from ooxml.scripts.pack import CONVERSION_FILTERS, validate_document
+
+
+class WorkerUnavailable(Exception):
+    """Raised when a worker cannot be started."""
+
+
+class SofficeWorker:
+    """
+    A headless LibreOffice listener that converts documents over UNO.
+
+    Each worker has its own user profile, so several can run side by side.
+    """
+
+    # Seconds to wait for a new listener to accept connections
+    STARTUP_TIMEOUT = 60
+
+    def __init__(self):
+        self.process = None
+        self.profile_dir = None
+        self.desktop = None
+
+    def start(self):
+        """Start the listener and connect to it.
+
+        Raises:
+            WorkerUnavailable: If uno or soffice is missing or soffice does not start
+        """
+        try:
+            import uno  # Only available with LibreOffice's Python bindings
+        except ImportError as e:
+            raise WorkerUnavailable("LibreOffice Python bindings (uno) not found") from e
+
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="soffice_profile_"))
+        try:
+            self._launch(uno)
+        except BaseException as e:
+            # Do not leave a listener running that cannot be used
+            self.close()
+            if isinstance(e, Exception) and not isinstance(e, WorkerUnavailable):
+                raise WorkerUnavailable(f"soffice worker did not start: {e}") from e
+            raise
+
+    def _launch(self, uno):
+        """Run soffice with a UNO listener and connect to its desktop."""
+        pipe_name = f"soffice_{os.getpid()}_{id(self)}"
+        try:
+            self.process = subprocess.Popen(
+                [
+                    "soffice",
+                    "--headless",
+                    "--invisible",
+                    "--nologo",
+                    "--norestore",
+                    "--nodefault",
+                    f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                    f"--accept=pipe,name={pipe_name};urp;StarOffice.ComponentContext",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError as e:
+            raise WorkerUnavailable("soffice not found") from e
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:  # NoConnectException until the listener is up
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    raise WorkerUnavailable("soffice listener did not start")
+                time.sleep(0.1)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def convert(self, doc_path, out_dir, filter_name):
+        """Convert a document to <out_dir>/<stem>.html with a LibreOffice filter.
+
+        Raises:
+            Exception: If the document cannot be loaded or converted
+        """
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def properties(**values):
+            return tuple(
+                PropertyValue(Name=name, Value=value) for name, value in values.items()
+            )
+
+        document = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(Path(doc_path).resolve())),
+            "_blank",
+            0,
+            properties(Hidden=True, ReadOnly=True),
+        )
+        if document is None:
+            raise ValueError("source file could not be loaded")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(Path(out_dir) / f"{doc_path.stem}.html")),
+                properties(FilterName=filter_name),
+            )
+        finally:
+            document.close(True)
+
+    def kill(self):
+        """Stop the listener at once, interrupting a running conversion."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def close(self):
+        """Shut the listener down and remove its profile."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # The listener is already gone
+            self.desktop = None
+        elif self.process is not None and self.process.poll() is None:
+            # Never connected to, so it cannot be asked to terminate
+            self.process.kill()
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+
+class LocalWorker:
+    """
+    Stand-in for SofficeWorker with the same conversion contract, for testing.
+
+    A conversion checks that the document is a zip archive whose XML parts are
+    well-formed and writes <stem>.html listing its parts. Nothing is rendered, so
+    it does not catch what only LibreOffice rejects.
+    """
+
+    def start(self):
+        pass
+
+    def is_alive(self):
+        return True
+
+    def convert(self, doc_path, out_dir, filter_name):
+        with zipfile.ZipFile(doc_path) as zf:
+            names = zf.namelist()
+            for name in names:
+                if name.endswith((".xml", ".rels")):
+                    defusedxml.ElementTree.fromstring(zf.read(name))
+        items = "".join(f"<li>{name}</li>" for name in names)
+        (Path(out_dir) / f"{doc_path.stem}.html").write_text(
+            f"<html><body><ul>{items}</ul></body></html>", encoding="utf-8"
+        )
+
+    def kill(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SofficePool:
+    """
+    Pool of warm workers validating Office files by converting them to HTML.
+
+    validate() and validate_async() follow pack.validate_document: they return
+    True if the file converts, and print the reason to stderr if it does not.
+    A conversion running longer than the timeout is stopped by killing its
+    worker, which is then restarted. Slots without a worker, including workers
+    that cannot be started, use validate_document, which starts soffice for each
+    file.
+    """
+
+    def __init__(self, workers=2, timeout=10, worker_class=None):
+        """
+        Start the workers.
+
+        Args:
+            workers: Number of conversions run at the same time (default: 2)
+            timeout: Seconds a conversion may take on a worker; validate_document
+                has its own timeout (default: 10)
+            worker_class: None to validate with validate_document (default),
+                SofficeWorker to keep LibreOffice listeners running (opt-in, not
+                yet verified against LibreOffice), or LocalWorker for testing
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.timeout = timeout
+        self.worker_class = worker_class
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+        # Idle workers; None stands for a slot that uses validate_document
+        self._idle = queue.Queue()
+        futures = [self._executor.submit(self._start_worker) for _ in range(workers)]
+        try:
+            started = [future.result() for future in futures]
+        except BaseException:
+            # Shut down the workers that did start before giving up
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    if future.result() is not None:
+                        future.result().close()
+            raise
+        for worker in started:
+            self._idle.put(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_worker(self):
+        """Start a worker, or return None if there is none or it cannot be started."""
+        if self.worker_class is None:
+            return None
+        worker = self.worker_class()
+        try:
+            worker.start()
+        except Exception as e:
+            worker.close()
+            reason = e
+            if not isinstance(e, WorkerUnavailable):
+                reason = f"Worker did not start ({type(e).__name__}: {e})"
+            print(
+                f"Warning: {reason}. Validating with one soffice process per file.",
+                file=sys.stderr,
+            )
+            return None
+        return worker
+
+    def submit(self, doc_path):
+        """Queue a validation and return a concurrent.futures.Future of its result."""
+        return self._executor.submit(self._validate, Path(doc_path))
+
+    def validate(self, doc_path):
+        """Validate a document on an idle worker, waiting for one if needed."""
+        return self.submit(doc_path).result()
+
+    async def validate_async(self, doc_path):
+        """Validate a document on an idle worker without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(doc_path))
+
+    def _validate(self, doc_path):
+        worker = self._idle.get()
+        try:
+            if worker is None:
+                return validate_document(doc_path)
+            return self._convert(worker, doc_path)
+        finally:
+            if worker is not None and not worker.is_alive():
+                worker.close()
+                worker = self._start_worker()
+            self._idle.put(worker)
+
+    def _convert(self, worker, doc_path):
+        filter_name = CONVERSION_FILTERS[doc_path.suffix.lower()]
+        timed_out = threading.Event()
+
+        def stop():
+            timed_out.set()
+            worker.kill()
+
+        timer = threading.Timer(self.timeout, stop)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            timer.start()
+            try:
+                worker.convert(doc_path, Path(temp_dir), filter_name)
+            except Exception as e:
+                if not timed_out.is_set():
+                    print(f"Validation error: {e}", file=sys.stderr)
+                    return False
+            finally:
+                timer.cancel()
+
+            if timed_out.is_set():
+                print("Validation error: Timeout during conversion", file=sys.stderr)
+                return False
+            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
+                print("Validation error: Document validation failed", file=sys.stderr)
+                return False
+            return True
+
+    def close(self):
+        """Wait for queued validations and shut all workers down."""
+        self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            worker = self._idle.get()
+            if worker is not None:
+                worker.close()
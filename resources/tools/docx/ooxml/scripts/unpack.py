@@ -1,29 +1,217 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage:
+    python unpack.py <office_file> <output_dir> [--parts PART ...] [--raw] [--jobs N]
+
+Example usage from Python:
+    from ooxml.scripts.unpack import unpack_document
+
+    # Extract only the main document part and pretty-print it
+    unpack_document("report.docx", "unpacked", parts=["word/document.xml"])
+
+    # Extract everything, pretty-printing each XML part when XMLEditor opens it
+    unpack_document("report.docx", "unpacked", pretty="lazy")
+"""
+
+import argparse
+import hashlib
 import random
 import sys
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+try:
+    from .workfiles import PENDING_PARTS_FILE
+except ImportError:  # Run as a script rather than imported from ooxml.scripts
+    from workfiles import PENDING_PARTS_FILE
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--parts",
+        nargs="+",
+        help="Only extract these parts (e.g. word/document.xml)",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Leave XML parts as stored instead of pretty-printing them",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for pretty-printing XML files (default: 1)",
+    )
+    args = parser.parse_args()
+
+    try:
+        unpack_document(
+            args.office_file,
+            args.output_dir,
+            parts=args.parts,
+            pretty=not args.raw,
+            jobs=args.jobs,
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, parts=None, pretty=True, jobs=1):
+    """Unpack an Office file (.docx/.pptx/.xlsx) into a directory.
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to extract into, created if needed
+        parts: Names of the parts to extract (e.g. ["word/document.xml"]), or None
+            for all parts
+        pretty: True to pretty-print the extracted XML parts, False to leave them
+            as stored, or "lazy" to leave them as stored until XMLEditor (and so
+            the Document library) opens them; anything else reading the files
+            sees them unformatted (default: True)
+        jobs: Number of processes for pretty-printing XML parts (default: 1)
+
+    Returns:
+        list: Paths of the extracted files
+
+    Raises:
+        ValueError: If a requested part is not in the file, or pretty or jobs is
+            not valid
+    """
+    if pretty not in (True, False, "lazy"):
+        raise ValueError(f"pretty must be True, False or 'lazy', not {pretty!r}")
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # Extract the requested parts
+    with zipfile.ZipFile(input_file) as zf:
+        names = zf.namelist()
+        if parts is not None:
+            wanted = set(parts)
+            missing = sorted(wanted - set(names))
+            if missing:
+                raise ValueError(f"{input_file} has no part {', '.join(missing)}")
+            names = [name for name in names if name in wanted]
+        extracted = [Path(zf.extract(name, output_path)) for name in names]
+
+    xml_files = [
+        f for f in extracted if f.is_file() and f.name.endswith((".xml", ".rels"))
+    ]
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
+    # Parts extracted again replace any lazily extracted ones
+    pending = _read_pending_parts(output_path)
+    for f in extracted:
+        pending.pop(f.relative_to(output_path).as_posix(), None)
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
+    # Pretty print XML files now, or once they are opened
+    if pretty == "lazy":
+        for f in xml_files:
+            pending[f.relative_to(output_path).as_posix()] = _content_hash(
+                f.read_bytes()
+            )
+    elif pretty and jobs == 1:
+        for xml_file in xml_files:
+            _pretty_print_xml(xml_file)
+    elif pretty:
+        # Each file is formatted on its own, so the order they finish in does not matter
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(
+                executor.map(
+                    _pretty_print_xml,
+                    xml_files,
+                    chunksize=max(1, len(xml_files) // (jobs * 4)),
+                )
+            )
+    _write_pending_parts(output_path, pending)
+
+    return extracted
+
+
+def pretty_print_pending(unpacked_dir, parts):
+    """Pretty-print the given parts if they were extracted with pretty="lazy".
+
+    The pending parts are listed in the unpacked directory, so they are found in
+    copies of it (such as Document's working copy) and by other processes. Parts
+    changed since they were extracted are left alone. Either way they are no
+    longer pending afterwards.
+
+    Args:
+        unpacked_dir: Directory the Office file was unpacked into
+        parts: Names of the parts relative to it (e.g. ["word/document.xml"])
+
+    Returns:
+        list: Names of the parts that were pretty-printed
+    """
+    output_path = Path(unpacked_dir)
+    pending = _read_pending_parts(output_path)
+    count = len(pending)
+    printed = []
+    for name in parts:
+        name = Path(name).as_posix()
+        content_hash = pending.pop(name, None)
+        xml_file = output_path / name
+        if content_hash is None or not xml_file.is_file():
+            continue
+        if _content_hash(xml_file.read_bytes()) == content_hash:
+            _pretty_print_xml(xml_file)
+            printed.append(name)
+    if len(pending) != count:
+        _write_pending_parts(output_path, pending)
+    return printed
+
+
+def _read_pending_parts(output_path):
+    """Read PENDING_PARTS_FILE into a dict of part name to content hash."""
+    try:
+        lines = (output_path / PENDING_PARTS_FILE).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    pending = {}
+    for line in lines.splitlines():
+        content_hash, _, name = line.partition(" ")
+        pending[name] = content_hash
+    return pending
+
+
+def _write_pending_parts(output_path, pending):
+    """Write PENDING_PARTS_FILE, or remove it when no part is pending."""
+    pending_file = output_path / PENDING_PARTS_FILE
+    if not pending:
+        pending_file.unlink(missing_ok=True)
+        return
+    pending_file.write_text(
+        "".join(f"{content_hash} {name}\n" for name, content_hash in pending.items()),
+        encoding="utf-8",
+    )
+
+
+def _content_hash(content):
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _pretty_print_xml(xml_file):
+    """Pretty-print an extracted XML file in place."""
     content = xml_file.read_text(encoding="utf-8")
     dom = defusedxml.minidom.parseString(content)
     xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+if __name__ == "__main__":
+    main()
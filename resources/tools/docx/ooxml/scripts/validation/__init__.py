@@ -4,12 +4,18 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .manifest import ValidationManifest
+from .original import OriginalPackage
+from .package import PackageGraph
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "OriginalPackage",
+    "PackageGraph",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "ValidationManifest",
 ]
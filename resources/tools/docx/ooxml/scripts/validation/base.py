@@ -2,11 +2,30 @@
 Base validator with common validation logic for document files.
 """
 
+import hashlib
+import posixpath
 import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .original import OriginalPackage
+from .package import PackageGraph
+from .rules import (
+    IgnorableNamespaceRule,
+    RelationshipReferenceRule,
+    RootNameRule,
+    UniqueIdRule,
+    stream_rules,
+    walk_rules,
+)
+
+try:
+    from ..workfiles import PENDING_PARTS_FILE
+except ImportError:  # Loaded by validate.py as a top-level package
+    from workfiles import PENDING_PARTS_FILE
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -84,6 +103,10 @@ class BaseSchemaValidator:
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    # Compiled XSD schemas by resolved schema path, shared by every validator in
+    # the process (see _get_schema)
+    _compiled_schemas = {}
+
     # All allowed OOXML namespaces (superset of all document types)
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
@@ -103,45 +126,230 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # Element rules run in one walk per part (see _get_rule_result)
+    RULES = (
+        RootNameRule,
+        IgnorableNamespaceRule,
+        RelationshipReferenceRule,
+        UniqueIdRule,
+    )
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        jobs=1,
+        manifest=None,
+        stream=False,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Worker processes for XSD validation (1 validates in this process)
+        self.jobs = max(1, jobs)
+        # Optional ValidationManifest with per-part facts of earlier validations
+        self.manifest = manifest
+        # Run the non-XSD checks over streamed parts instead of parsed trees. Only
+        # their memory is bounded: the XSD pass still parses each part in full
+        self.stream = stream
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
-        # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
+        # List the package once, skipping PENDING_PARTS_FILE, which is not a
+        # part, then pick out all XML and .rels files
+        self.files = [
+            f
+            for f in self.unpacked_dir.rglob("*")
+            if f.is_file() and f != self.unpacked_dir / PENDING_PARTS_FILE
+        ]
         self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
+            f
+            for suffix in [".xml", ".rels"]
+            for f in self.files
+            if f.name.endswith(suffix)
         ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks, keyed by file path (see _get_tree)
+        self._trees = {}
+        self._original_package = None
+        self._package_graph = None
+
+        # Content hashes of parts and rule results, keyed by file path
+        self._digests = {}
+        self._rule_results = {}
+        if self.manifest is not None:
+            self.manifest.forget_missing(
+                f.relative_to(self.unpacked_dir).as_posix() for f in self.xml_files
+            )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    @property
+    def original_package(self):
+        """Shared read-only view of the original file (see OriginalPackage)."""
+        if self._original_package is None:
+            self._original_package = OriginalPackage.open(self.original_file)
+        return self._original_package
+
+    @property
+    def package_graph(self):
+        """Parts and references of the unpacked package, built on first use (see PackageGraph)."""
+        if self._package_graph is None:
+            self._package_graph = self._build_package_graph()
+        return self._package_graph
+
+    def _build_package_graph(self):
+        """Read the .rels parts, [Content_Types].xml and r:id references into a PackageGraph."""
+        parts = [f.relative_to(self.unpacked_dir).as_posix() for f in self.files]
+        part_set = set(parts)
+
+        def read(compute, *args):
+            try:
+                return compute(*args)
+            except Exception as e:
+                return e
+
+        relationships = {
+            part: read(
+                self._part_fact,
+                self.unpacked_dir / part,
+                "relationships",
+                self._get_relationships,
+            )
+            for part in parts
+            if part.endswith(".rels")
+        }
+
+        content_types = None
+        if PackageGraph.CONTENT_TYPES_PART in part_set:
+            content_types = read(
+                self._part_fact,
+                self.unpacked_dir / PackageGraph.CONTENT_TYPES_PART,
+                "content_types",
+                self._get_content_types,
+            )
+
+        references = {
+            part: read(
+                self._get_rule_result,
+                self.unpacked_dir / part,
+                RelationshipReferenceRule.name,
+            )
+            for part in parts
+            if part.endswith(".xml")
+            and PackageGraph.rels_part_of(part) in relationships
+        }
+
+        return PackageGraph(parts, relationships, content_types, references)
+
+    def _get_tree(self, xml_file):
+        """Parse an XML file once per validator and return the shared tree.
+
+        Every check reads the same tree, so it must not be modified; checks that
+        edit it work on a copy. Parse errors are cached as well and raised again
+        on each call, so each file is parsed at most once per validator.
+
+        In stream mode trees are not kept: only XSD validation and checks of
+        small package parts (.rels, [Content_Types].xml) still build them. The
+        XSD pass cleans a copy of the whole tree before validating it, so it
+        cannot be streamed and holds each part, however large, in memory.
+        """
+        key = Path(xml_file)
+        if key not in self._trees:
+            try:
+                tree = lxml.etree.parse(str(key))
+            except Exception as e:
+                self._trees[key] = e
+            else:
+                if self.stream:
+                    return tree
+                self._trees[key] = tree
+        tree = self._trees[key]
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def _part_key(self, xml_file):
+        """Get the manifest key of a part: (path relative to unpacked_dir, content hash)."""
+        xml_file = Path(xml_file)
+        if xml_file not in self._digests:
+            digest = hashlib.sha256()
+            with open(xml_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._digests[xml_file] = digest.hexdigest()
+        part = xml_file.relative_to(self.unpacked_dir).as_posix()
+        return part, self._digests[xml_file]
+
+    def _part_fact(self, xml_file, name, compute):
+        """Get a per-part fact, computed by compute(xml_file).
+
+        With a manifest the fact is cached by the part's content hash, so it is
+        computed again only once the part changes. Exceptions raised by compute
+        are not cached; they propagate to the check, which reports them as before.
+        """
+        if self.manifest is None:
+            return compute(xml_file)
+
+        part, digest = self._part_key(xml_file)
+        try:
+            return self.manifest.get(part, digest, name)
+        except KeyError:
+            fact = compute(xml_file)
+            self.manifest.put(part, digest, name, fact)
+            return fact
+
+    def _get_rule_result(self, xml_file, name):
+        """Get the result of one of RULES for a part.
+
+        The first request for a part runs all rules that apply to it in a single
+        walk of its tree, or of the streamed part in stream mode; the results are
+        kept for the validator's lifetime and, with a manifest, for as long as the
+        part is unchanged. Parse errors are kept as well and raised to each check,
+        which reports them as before.
+        """
+        key = Path(xml_file)
+        if key not in self._rule_results:
+            fact_name = ("rules",) + tuple(rule.name for rule in self.RULES)
+            try:
+                self._rule_results[key] = self._part_fact(
+                    key, fact_name, self._run_rules
+                )
+            except Exception as e:
+                self._rule_results[key] = e
+        results = self._rule_results[key]
+        if isinstance(results, Exception):
+            raise results
+        return results[name]
+
+    def _run_rules(self, xml_file):
+        """Run all RULES that apply to an XML file in one walk and return their results."""
+        rules = [
+            rule(self, xml_file)
+            for rule in self.RULES
+            if rule.files is None or xml_file.name in rule.files
+        ]
+        if self.stream:
+            stream_rules(str(xml_file), rules)
+        else:
+            walk_rules(self._get_tree(xml_file).getroot(), rules)
+        return {rule.name: rule.result() for rule in rules}
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+            error = self._part_fact(xml_file, "xml_error", self._get_xml_error)
+            if error:
+                errors.append(f"  {xml_file.relative_to(self.unpacked_dir)}: {error}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -153,24 +361,29 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _get_xml_error(self, xml_file):
+        """Get the well-formedness error of an XML file, or None if it parses."""
+        try:
+            # Try to parse the XML file (streamed along with the rules in stream mode)
+            if self.stream:
+                self._get_rule_result(xml_file, RootNameRule.name)
+            else:
+                self._get_tree(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return f"Line {e.lineno}: {e.msg}"
+        except Exception as e:
+            return f"Unexpected error: {str(e)}"
+        return None
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
+                errors.extend(
+                    self._get_rule_result(xml_file, IgnorableNamespaceRule.name)
+                )
             except lxml.etree.XMLSyntaxError:
                 continue
 
@@ -190,74 +403,40 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
+                occurrences = self._get_rule_result(xml_file, UniqueIdRule.name)
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
+                for tag, attr_name, scope, id_value, line in occurrences:
+                    if scope == "global":
+                        # Check global uniqueness
+                        if id_value in global_ids:
+                            prev_file, prev_line, prev_tag = global_ids[id_value]
+                            errors.append(
+                                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                                f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
                             )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
+                        else:
+                            global_ids[id_value] = (
+                                xml_file.relative_to(self.unpacked_dir),
+                                line,
+                                tag,
+                            )
+                    elif scope == "file":
+                        # Check file-level uniqueness
+                        key = (tag, attr_name)
+                        if key not in file_ids:
+                            file_ids[key] = {}
+
+                        if id_value in file_ids[key]:
+                            prev_line = file_ids[key][id_value]
+                            errors.append(
+                                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                f"Line {line}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                f"(first occurrence at line {prev_line})"
+                            )
+                        else:
+                            file_ids[key][id_value] = line
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -279,94 +458,59 @@ class BaseSchemaValidator:
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        graph = self.package_graph
 
-        # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
-
-        if not rels_files:
+        if not graph.relationship_parts:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Get all files in the package (excluding reference files)
+        all_files = {
+            part
+            for part in graph.parts
+            if posixpath.basename(part) != "[Content_Types].xml"
+            and not part.endswith(".rels")
+        }  # These files are not referenced by .rels
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(graph.relationship_parts)} .rels files and {len(all_files)} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
+        for rels_part in graph.relationship_parts:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
+                for _, _, target, line in graph.get_relationships(rels_part):
                     if target and not target.startswith(
                         ("http", "mailto:")
                     ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
+                        # Resolve the target relative to the .rels file location
+                        target_part = graph.resolve_target(rels_part, target)
+                        if target_part in graph.part_set:
+                            all_referenced_files.add(target_part)
                         else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
+                            broken_refs.append((target, line))
 
                 # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+                for broken_ref, line_num in broken_refs:
+                    errors.append(
+                        f"  {rels_part}: Line {line_num}: Broken reference to {broken_ref}"
+                    )
 
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                errors.append(f"  Error parsing {rels_part}: {e}")
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
+        unreferenced_files = all_files - all_referenced_files
 
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        for unref_file in sorted(unreferenced_files, key=lambda part: part.split("/")):
+            errors.append(f"  Unreferenced file: {unref_file}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -385,14 +529,28 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _get_relationships(self, rels_file):
+        """Get the relationships declared in a .rels file.
+
+        Returns:
+            list: (id, type, target, line) tuples in document order, with None for
+            a missing Id or Target and "" for a missing Type
+        """
+        rels_root = self._get_tree(rels_file).getroot()
+        return [
+            (rel.get("Id"), rel.get("Type", ""), rel.get("Target"), rel.sourceline)
+            for rel in rels_root.findall(
+                f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+            )
+        ]
+
     def validate_all_relationship_ids(self):
         """
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
+        graph = self.package_graph
 
         # Process each XML file that might contain r:id references
         for xml_file in self.xml_files:
@@ -401,30 +559,23 @@ class BaseSchemaValidator:
                 continue
 
             # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            rels_part = graph.rels_part_of(xml_rel_path.as_posix())
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if rels_part not in graph.part_set:
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Get valid relationship IDs and their types from the .rels file
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
+                for rid, rel_type, _, line in graph.get_relationships(rels_part):
                     if rid:
                         # Check for duplicate rIds
                         if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
                             errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
+                                f"  {rels_part}: Line {line}: "
                                 f"Duplicate relationship ID '{rid}' (IDs must be unique)"
                             )
                         # Extract just the type name from the full URL
@@ -433,43 +584,33 @@ class BaseSchemaValidator:
                         )
                         rid_to_type[rid] = type_name
 
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                # Check all r:id references of the XML file
+                for elem_name, rid_attr, line in graph.get_references(
+                    xml_rel_path.as_posix()
+                ):
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {line}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
                         )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(
+                            elem_name
+                        )
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {line}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
 
             except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
                 errors.append(f"  Error processing {xml_rel_path}: {e}")
 
         if errors:
@@ -522,34 +663,16 @@ class BaseSchemaValidator:
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
+        graph = self.package_graph
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if graph.CONTENT_TYPES_PART not in graph.part_set:
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Get all declared parts and extensions
+            declared_parts, declared_extensions = graph.get_content_types()
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +698,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -593,8 +712,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
+                    root_name = self._get_rule_result(xml_file, RootNameRule.name)
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
@@ -605,22 +723,22 @@ class BaseSchemaValidator:
                     continue  # Skip unparseable files
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for part in graph.parts:
                 # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
+                path = PurePosixPath(part)
+                if path.suffix.lower() in {".xml", ".rels"}:
                     continue
-                if file_path.name == "[Content_Types].xml":
+                if path.name == "[Content_Types].xml":
                     continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                if "_rels" in path.parts or "docProps" in path.parts:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
+                extension = path.suffix.lstrip(".").lower()
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            f'  {part}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
 
         except Exception as e:
@@ -638,6 +756,30 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _get_content_types(self, content_types_file):
+        """Get the part names and extensions declared in [Content_Types].xml.
+
+        Returns:
+            tuple: (declared_parts, declared_extensions) frozensets
+        """
+        root = self._get_tree(content_types_file).getroot()
+        declared_parts = set()
+        declared_extensions = set()
+
+        # Get Override declarations (specific files)
+        for override in root.findall(f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                declared_parts.add(part_name.lstrip("/"))
+
+        # Get Default declarations (by extension)
+        for default in root.findall(f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                declared_extensions.add(extension.lower())
+
+        return frozenset(declared_parts), frozenset(declared_extensions)
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -673,7 +815,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +834,9 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd()
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +852,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +878,58 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Validate all XML files against XSD schemas and return results in file order.
+
+        With a manifest, results of parts that are unchanged since an earlier
+        validation against the same original are reused. With jobs > 1 the
+        remaining files are spread across a process pool. Each worker builds its
+        own validator, so it compiles every schema it needs and reads the original
+        package once; results come back in file order, so the report is the same
+        as for a serial run.
+        """
+        results = {}
+        original = self.original_file.resolve()
+        stat = original.stat()
+        fact_name = ("xsd", str(original), stat.st_size, stat.st_mtime_ns)
+        if self.manifest is not None:
+            for xml_file in self.xml_files:
+                try:
+                    results[xml_file] = self.manifest.get(
+                        *self._part_key(xml_file), fact_name
+                    )
+                except KeyError:
+                    pass
+
+        pending = [f for f in self.xml_files if f not in results]
+        if self.jobs == 1 or len(pending) < 2:
+            computed = [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in pending
+            ]
+        else:
+            workers = min(self.jobs, len(pending))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_xsd_worker,
+                initargs=(
+                    type(self), self.unpacked_dir, self.original_file, self.stream
+                ),
+            ) as pool:
+                computed = list(
+                    pool.map(
+                        _validate_file_in_worker,
+                        pending,
+                        chunksize=max(1, len(pending) // (workers * 4)),
+                    )
+                )
+
+        for xml_file, result in zip(pending, computed):
+            results[xml_file] = result
+            if self.manifest is not None:
+                self.manifest.put(*self._part_key(xml_file), fact_name, result)
+        return [results[xml_file] for xml_file in self.xml_files]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -830,42 +1022,56 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
-
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
-
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
-
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
-
+            return self._validate_tree_xsd(
+                self._get_tree(xml_file), schema_path, xml_file.relative_to(base_path)
+            )
         except Exception as e:
             return False, {str(e)}
 
+    def _validate_tree_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML tree against an XSD schema. Returns (is_valid, errors_set).
+
+        Preprocessing works on a copy, so shared trees (see _get_tree and
+        OriginalPackage.parse) can be passed in. relative_path is the file's path
+        inside the package.
+        """
+        # Load schema
+        schema = self._get_schema(schema_path)
+
+        # Preprocess XML
+        xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
+        xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+
+        # Clean ignorable namespaces if needed
+        if relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS:
+            xml_doc = self._clean_ignorable_namespaces(xml_doc)
+
+        # Validate
+        if schema.validate(xml_doc):
+            return True, set()
+        else:
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+            return False, errors
+
+    def _get_schema(self, schema_path):
+        """Compile an XSD schema once per process and return the compiled schema.
+
+        Schemas such as wml.xsd import large graphs of other schemas, so compiling
+        them dominates XSD validation; every file mapped to the same schema reuses
+        the compiled object.
+        """
+        key = Path(schema_path).resolve()
+        schema = self._compiled_schemas.get(key)
+        if schema is None:
+            with open(key, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=str(key))
+            schema = self._compiled_schemas[key] = lxml.etree.XMLSchema(xsd_doc)
+        return schema
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
@@ -875,33 +1081,30 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        # Error sets are cached on the shared original view, so each original
+        # file is validated at most once however often it is compared against
+        original = self.original_package
+        member = relative_path.as_posix()
+        schema_path = self._get_schema_path(xml_file)
+        key = (member, schema_path)
+        if key not in original.xsd_errors:
+            if member not in original or not schema_path:
                 # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+                errors = set()
+            else:
+                try:
+                    _, errors = self._validate_tree_xsd(
+                        original.parse(member), schema_path, relative_path
+                    )
+                except Exception as e:
+                    errors = {str(e)}
+            original.xsd_errors[key] = errors
+        return original.xsd_errors[key]
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -947,5 +1150,20 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+# Validator of the current worker process during parallel XSD validation
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, stream):
+    """Create the validator a worker process uses for all files it is given."""
+    global _worker_validator
+    _worker_validator = validator_class(unpacked_dir, original_file, stream=stream)
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate one XML file against XSD schemas in a worker process."""
+    return _worker_validator.validate_file_against_xsd(xml_file, verbose=False)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
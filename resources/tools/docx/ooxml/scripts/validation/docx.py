@@ -3,12 +3,131 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import ElementRule, stream_rules
+
+# Trailing whitespace check for text with line breaks (see _has_edge_whitespace)
+_TRAILING_WHITESPACE = re.compile(r".*\s$")
+
+
+def _has_edge_whitespace(text):
+    r"""Check whether text starts or ends with whitespace.
+
+    Same result as re.match(r"^\s.*", text) or re.match(r".*\s$", text), but
+    the regex only runs for the rare text with a line break in it.
+    """
+    if text[0].isspace():
+        return True
+    if not text[-1].isspace():
+        return False
+    return "\n" not in text or _TRAILING_WHITESPACE.match(text) is not None
+
+
+def _text_preview(text):
+    """Show a preview of the text."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class WhitespacePreservationRule(ElementRule):
+    """Find w:t elements with leading/trailing whitespace but no xml:space='preserve'."""
+
+    name = "whitespace_preservation"
+    files = {"document.xml"}
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = {f"{{{validator.WORD_2006_NAMESPACE}}}t"}
+        self.xml_space_attr = f"{{{validator.XML_NAMESPACE}}}space"
+        self.path = xml_file.relative_to(validator.unpacked_dir)
+        self.errors = []
+
+    def visit(self, elem, open_scopes):
+        text = elem.text
+        if (
+            text
+            and _has_edge_whitespace(text)
+            and elem.get(self.xml_space_attr) != "preserve"
+        ):
+            self.errors.append(
+                f"  {self.path}: "
+                f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+            )
+
+    def result(self):
+        return self.errors
+
+
+class DeletionRule(ElementRule):
+    """Find w:t elements with text inside w:del elements."""
+
+    name = "deletions"
+    files = {"document.xml"}
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = {f"{{{validator.WORD_2006_NAMESPACE}}}t"}
+        self.deletion = f"{{{validator.WORD_2006_NAMESPACE}}}del"
+        self.scopes = (self.deletion,)
+        self.path = xml_file.relative_to(validator.unpacked_dir)
+        self.errors = []
+
+    def visit(self, elem, open_scopes):
+        if open_scopes[self.deletion] and elem.text:
+            self.errors.append(
+                f"  {self.path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+    def result(self):
+        return self.errors
+
+
+class InsertionRule(ElementRule):
+    """Find w:delText elements inside w:ins elements that are not within a w:del."""
+
+    name = "insertions"
+    files = {"document.xml"}
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = {f"{{{validator.WORD_2006_NAMESPACE}}}delText"}
+        self.insertion = f"{{{validator.WORD_2006_NAMESPACE}}}ins"
+        self.deletion = f"{{{validator.WORD_2006_NAMESPACE}}}del"
+        self.scopes = (self.insertion, self.deletion)
+        self.path = xml_file.relative_to(validator.unpacked_dir)
+        self.errors = []
+
+    def visit(self, elem, open_scopes):
+        if open_scopes[self.insertion] and not open_scopes[self.deletion]:
+            self.errors.append(
+                f"  {self.path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+    def result(self):
+        return self.errors
+
+
+class ParagraphCountRule(ElementRule):
+    """Count the w:p elements below the root."""
+
+    name = "paragraph_count"
+    files = {"document.xml"}
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = {f"{{{validator.WORD_2006_NAMESPACE}}}p"}
+        self.count = 0
+
+    def visit(self, elem, open_scopes):
+        if elem.getparent() is not None:
+            self.count += 1
+
+    def result(self):
+        return self.count
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,6 +140,14 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Word-specific element rules, run in the same walk as the common ones
+    RULES = BaseSchemaValidator.RULES + (
+        WhitespacePreservationRule,
+        DeletionRule,
+        InsertionRule,
+        ParagraphCountRule,
+    )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
@@ -81,31 +208,9 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
+                errors.extend(
+                    self._get_rule_result(xml_file, WhitespacePreservationRule.name)
+                )
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
@@ -134,27 +239,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
+                errors.extend(self._get_rule_result(xml_file, DeletionRule.name))
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
@@ -180,10 +265,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                count = self._get_rule_result(xml_file, ParagraphCountRule.name)
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -194,15 +276,14 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            if self.stream:
+                # Count without building the tree of the original document
+                rule = ParagraphCountRule(self, self.unpacked_dir / "word/document.xml")
+                with self.original_package.open_member("word/document.xml") as f:
+                    stream_rules(f, [rule])
+                count = rule.result()
+            else:
+                root = self.original_package.parse("word/document.xml").getroot()
 
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
@@ -225,26 +306,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
+                errors.extend(self._get_rule_result(xml_file, InsertionRule.name))
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
@@ -0,0 +1,50 @@
+"""
+Content-hash manifest of per-part validation facts.
+"""
+
+
+class ValidationManifest:
+    """
+    Per-part validation facts and results, keyed by the content hash of each part.
+
+    Pass the same manifest to successive validators of one unpacked package (see
+    Document.validate). A validator then only recomputes facts such as the IDs a
+    part declares, its relationships or its XSD errors for parts whose content
+    changed since the previous validation; cross-part checks are recomputed from
+    the cached facts without parsing unchanged parts again.
+
+    Facts must not be modified by the checks that read them.
+    """
+
+    def __init__(self):
+        # Relative part path -> (content hash, {fact name: fact})
+        self._parts = {}
+
+    def get(self, part, digest, name):
+        """
+        Get a cached fact of a part.
+
+        Args:
+            part: Path of the part relative to the package root (e.g. "word/document.xml")
+            digest: Content hash of the part as it is now
+            name: Name of the fact
+
+        Raises:
+            KeyError: If the fact was not recorded for this content of the part
+        """
+        entry = self._parts.get(part)
+        if entry is None or entry[0] != digest:
+            raise KeyError(name)
+        return entry[1][name]
+
+    def put(self, part, digest, name, fact):
+        """Record a fact of a part, dropping all facts of its earlier content."""
+        entry = self._parts.get(part)
+        if entry is None or entry[0] != digest:
+            entry = self._parts[part] = (digest, {})
+        entry[1][name] = fact
+
+    def forget_missing(self, parts):
+        """Drop the facts of parts that are no longer in the package."""
+        for part in set(self._parts) - set(parts):
+            del self._parts[part]
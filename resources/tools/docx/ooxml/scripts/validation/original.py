@@ -0,0 +1,99 @@
+"""
+Read-only view of the original package that validators compare against.
+"""
+
+import io
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+class OriginalPackage:
+    """
+    Read-only view of an original Office package, read straight from its zip.
+
+    Members are read on demand instead of extracting the package to disk, and
+    views are shared: open() returns the same view for the same unchanged file,
+    so all validators of a run (and later runs against the same original) open
+    the zip once and reuse what was parsed or computed from it.
+
+    Attributes:
+        path: Resolved path to the package file
+        xsd_errors: Member name -> set of XSD error messages of that member,
+            filled in by the schema validators
+    """
+
+    # Most recently opened views, oldest first: path -> ((size, mtime), view)
+    _views = {}
+    _MAX_VIEWS = 4
+
+    @classmethod
+    def open(cls, path):
+        """Get the shared view of a package file, opening it if needed.
+
+        A cached view is reused only while the file's size and modification time
+        are unchanged. Views dropped from the cache close their zip once no
+        validator holds them any more.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        cached = cls._views.pop(path, None)
+        if cached is not None and cached[0] == signature:
+            view = cached[1]
+        else:
+            view = cls(path)
+        cls._views[path] = (signature, view)
+        while len(cls._views) > cls._MAX_VIEWS:
+            del cls._views[next(iter(cls._views))]
+        return view
+
+    def __init__(self, path):
+        """Open a package file.
+
+        Args:
+            path: Path to the .docx/.pptx/.xlsx file
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a zip archive
+        """
+        self.path = Path(path).resolve()
+        self._zip = zipfile.ZipFile(self.path, "r")
+        self._names = set(self._zip.namelist())
+        self._trees = {}
+        self.xsd_errors = {}
+
+    def __contains__(self, name):
+        """Check whether the package has a member (e.g. "word/document.xml")."""
+        return name in self._names
+
+    def read(self, name):
+        """Read a member's bytes.
+
+        Raises:
+            KeyError: If the package has no such member
+        """
+        return self._zip.read(name)
+
+    def open_member(self, name):
+        """Open a member for reading without loading it into memory.
+
+        Raises:
+            KeyError: If the package has no such member
+        """
+        return self._zip.open(name)
+
+    def parse(self, name):
+        """Parse a member with lxml once and return the shared tree.
+
+        The tree is shared by every caller and must not be modified.
+
+        Raises:
+            KeyError: If the package has no such member
+            lxml.etree.XMLSyntaxError: If the member is not well-formed
+        """
+        if name not in self._trees:
+            self._trees[name] = lxml.etree.parse(io.BytesIO(self.read(name)))
+        return self._trees[name]
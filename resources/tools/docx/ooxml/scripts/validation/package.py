@@ -0,0 +1,93 @@
+"""
+Graph of the parts of an unpacked Office package and the references between them.
+"""
+
+import posixpath
+
+
+class PackageGraph:
+    """
+    Parts, relationships, content types and r:id references of an unpacked package.
+
+    A validator builds the graph once (see BaseSchemaValidator.package_graph), so
+    the package-level checks look parts up in sets instead of listing the package
+    directory and reading the .rels files and [Content_Types].xml again for each
+    check.
+
+    Part names are paths relative to the package root with forward slashes (e.g.
+    "word/document.xml"). Facts that could not be read are kept as the exception
+    raised while reading them and raised again by the accessors, so each check
+    reports them as before.
+
+    Attributes:
+        parts: Names of all files of the package, in directory walk order
+        part_set: The same names as a frozenset
+        relationship_parts: Names of the .rels parts, in directory walk order
+    """
+
+    CONTENT_TYPES_PART = "[Content_Types].xml"
+
+    def __init__(self, parts, relationships, content_types, references):
+        """
+        Args:
+            parts: Names of all files of the package, in directory walk order
+            relationships: .rels part name -> list of (id, type, target, line)
+                tuples, or the exception raised reading the part
+            content_types: (override part names, default extensions) frozensets
+                declared in [Content_Types].xml, the exception raised reading it,
+                or None if the package has no [Content_Types].xml
+            references: Part name -> list of (element_name, relationship_id, line)
+                tuples, or the exception raised reading the part, for each part
+                that has a .rels part
+        """
+        self.parts = list(parts)
+        self.part_set = frozenset(self.parts)
+        self.relationship_parts = list(relationships)
+        self._relationships = relationships
+        self._content_types = content_types
+        self._references = references
+
+    @staticmethod
+    def _unwrap(fact):
+        if isinstance(fact, Exception):
+            raise fact
+        return fact
+
+    def get_relationships(self, rels_part):
+        """Get the (id, type, target, line) relationships declared in a .rels part."""
+        return self._unwrap(self._relationships[rels_part])
+
+    def get_references(self, part):
+        """Get the (element_name, relationship_id, line) r:id references of a part."""
+        return self._unwrap(self._references[part])
+
+    def get_content_types(self):
+        """Get the (override part names, default extensions) of [Content_Types].xml.
+
+        Returns None if the package has no [Content_Types].xml.
+        """
+        return self._unwrap(self._content_types)
+
+    @staticmethod
+    def rels_part_of(part):
+        """Get the name of the .rels part holding a part's relationships.
+
+        For dir/file.xml it is dir/_rels/file.xml.rels.
+        """
+        directory, name = posixpath.split(part)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def resolve_target(rels_part, target):
+        """Get the part name a relationship target of a .rels part points to.
+
+        Targets of the root .rels part are relative to the package root; those of
+        other .rels parts are relative to the directory of the part they belong to
+        (e.g. word/_rels/document.xml.rels -> word/). The result is normalized
+        but may name a part that does not exist.
+        """
+        if posixpath.basename(rels_part) == ".rels":
+            base_dir = ""
+        else:
+            base_dir = posixpath.dirname(posixpath.dirname(rels_part))
+        return posixpath.normpath(posixpath.join(base_dir, target))
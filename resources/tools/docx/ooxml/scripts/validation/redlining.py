@@ -2,22 +2,30 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import difflib
+import hashlib
 from pathlib import Path
 
+import lxml.etree
+
+from .original import OriginalPackage
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(
+        self, unpacked_dir, original_docx, verbose=False, authors=("Claude",)
+    ):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
+        # Authors whose tracked changes are validated, and how messages name them
+        self.authors = frozenset(authors)
+        self.author_names = " and ".join(sorted(self.authors))
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
@@ -27,94 +35,73 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
+        # Parse the modified document once, for both the check below and the comparison
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
+            modified_root = lxml.etree.parse(str(modified_file)).getroot()
+            parse_error = None
+        except lxml.etree.XMLSyntaxError as e:
             # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+            modified_root = None
+            parse_error = e
 
+        # Redlining validation is only needed if the authors made tracked changes.
+        if modified_root is not None and not self._has_tracked_changes(modified_root):
             if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
+                print(f"PASSED - No tracked changes by {self.author_names} found.")
             return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        # Read the original document.xml straight from the original package
+        try:
+            original = OriginalPackage.open(self.original_docx)
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
+
+        if "word/document.xml" not in original:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+
+        # The original's tree is shared and is only read, never modified
+        try:
+            if parse_error is not None:
+                raise parse_error
+            original_root = original.parse("word/document.xml").getroot()
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+
+        # Extract and compare paragraphs with the authors' tracked changes removed,
+        # by fingerprint, so matching paragraphs are never compared or diffed as text
+        modified_paragraphs = self._extract_paragraphs(modified_root)
+        original_paragraphs = self._extract_paragraphs(original_root)
+        modified_fingerprints = self._fingerprint_paragraphs(modified_paragraphs)
+        original_fingerprints = self._fingerprint_paragraphs(original_paragraphs)
+
+        if modified_fingerprints != original_fingerprints:
+            # Show detailed character-level differences for each changed paragraph
+            error_message = self._generate_detailed_diff(
+                original_paragraphs,
+                modified_paragraphs,
+                original_fingerprints,
+                modified_fingerprints,
+            )
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print(f"PASSED - All changes by {self.author_names} are properly tracked")
+        return True
+
+    def _generate_detailed_diff(
+        self,
+        original_paragraphs,
+        modified_paragraphs,
+        original_fingerprints,
+        modified_fingerprints,
+    ):
+        """Generate detailed character-level differences for each changed paragraph."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
+            f"FAILED - Document text doesn't match after removing {self.author_names}'s tracked changes",
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -125,154 +112,138 @@ class RedliningValidator:
             "  - To reject another's INSERTION: Nest <w:del> inside their <w:ins>",
             "  - To restore another's DELETION: Add new <w:ins> AFTER their <w:del>",
             "",
+            "Differences:",
+            "============",
+            self._get_word_diff(
+                original_paragraphs,
+                modified_paragraphs,
+                original_fingerprints,
+                modified_fingerprints,
+            ),
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
-
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+    def _get_word_diff(
+        self,
+        original_paragraphs,
+        modified_paragraphs,
+        original_fingerprints,
+        modified_fingerprints,
+    ):
+        """Generate a paragraph-aligned diff, in the style of git's plain word diff.
+
+        Paragraphs are aligned by fingerprint first; only paragraphs whose
+        fingerprints differ are diffed, each shown once with [-removed-] and
+        {+added+} text marked character by character, and removed or added
+        paragraphs are shown whole. Unchanged paragraphs are left out.
+        """
+        lines = []
+
+        matcher = difflib.SequenceMatcher(
+            None, original_fingerprints, modified_fingerprints, autojunk=False
+        )
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                continue
+            old = original_paragraphs[i1:i2]
+            new = modified_paragraphs[j1:j2]
+
+            # Pair up replaced paragraphs; extra ones were removed or added whole
+            for old_paragraph, new_paragraph in zip(old, new):
+                lines.append(self._diff_paragraph(old_paragraph, new_paragraph))
+            lines.extend(f"[-{paragraph}-]" for paragraph in old[len(new) :])
+            lines.extend(f"{{+{paragraph}+}}" for paragraph in new[len(old) :])
+
+        return "\n".join(lines)
+
+    def _diff_paragraph(self, old, new):
+        """Mark the character-level differences between two versions of a paragraph."""
+        parts = []
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                parts.append(old[i1:i2])
+                continue
+            if i2 > i1:
+                parts.append(f"[-{old[i1:i2]}-]")
+            if j2 > j1:
+                parts.append(f"{{+{new[j1:j2]}+}}")
+        return "".join(parts)
+
+    def _has_tracked_changes(self, root):
+        """Check whether the document has w:ins or w:del elements by the authors."""
+        w = self.namespaces["w"]
+        author_attr = f"{{{w}}}author"
+        return any(
+            elem.get(author_attr) in self.authors
+            for elem in root.iter(f"{{{w}}}ins", f"{{{w}}}del")
+        )
+
+    def _fingerprint_paragraphs(self, paragraphs):
+        """Hash each paragraph's text into a short fixed-size fingerprint."""
+        return [
+            hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).digest()
+            for paragraph in paragraphs
+        ]
+
+    def _extract_paragraphs(self, root):
+        """Extract each paragraph's text as it was before the authors' tracked changes.
+
+        A paragraph's text is the text of its w:t elements joined together. Text
+        inside the authors' w:ins elements is left out and the w:delText inside
+        their w:del elements is read as regular text, in a single walk that does
+        not modify the tree. The text of a nested paragraph also counts towards
+        the paragraphs enclosing it.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        w = self.namespaces["w"]
+        p_tag = f"{{{w}}}p"
+        t_tag = f"{{{w}}}t"
+        deltext_tag = f"{{{w}}}delText"
+        ins_tag = f"{{{w}}}ins"
+        del_tag = f"{{{w}}}del"
+        author_attr = f"{{{w}}}author"
+
+        paragraphs = []  # Text parts of each paragraph, in document order
+        open_paragraphs = []  # Indexes of the paragraphs enclosing the current element
+        inserted = 0  # Number of enclosing w:ins elements by the authors
+        deleted = 0  # Number of enclosing w:del elements by the authors
+
+        for event, elem in lxml.etree.iterwalk(
+            root,
+            events=("start", "end"),
+            tag=(p_tag, t_tag, deltext_tag, ins_tag, del_tag),
+        ):
+            tag = elem.tag
+            if tag == ins_tag or tag == del_tag:
+                if elem.get(author_attr) in self.authors:
+                    step = 1 if event == "start" else -1
+                    if tag == ins_tag:
+                        inserted += step
+                    else:
+                        deleted += step
+            elif inserted:
+                # The authors' insertions are removed along with everything inside them
+                continue
+            elif tag == p_tag:
+                if event == "start":
+                    open_paragraphs.append(len(paragraphs))
+                    paragraphs.append([])
+                else:
+                    open_paragraphs.pop()
+            elif event == "start" and elem.text and (tag == t_tag or deleted):
+                for index in open_paragraphs:
+                    paragraphs[index].append(elem.text)
+
+        # Skip empty paragraphs - they don't affect content validation
+        return [
+            paragraph_text
+            for paragraph_text in map("".join, paragraphs)
+            if paragraph_text
+        ]
 
 
 if __name__ == "__main__":
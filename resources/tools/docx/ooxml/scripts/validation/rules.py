@@ -0,0 +1,249 @@
+"""
+Single-pass rule engine for checks that inspect the elements of a part.
+
+Rules run either over a parsed tree (walk_rules) or over a part streamed with
+iterparse (stream_rules), which keeps the memory of the rule pass bounded for
+very large parts.
+"""
+
+import lxml.etree
+
+
+class ElementRule:
+    """
+    A check that inspects elements while a part is walked.
+
+    All rules of a validator share one walk per part (see walk_rules), so adding a
+    rule to a validator's RULES does not add another tree walk. A rule instance
+    checks one part; the validator reads result() once the walk is done.
+
+    Rules must only rely on an element's tag, attributes, text and parent when
+    visiting it: when streaming, elements are visited as they end and their
+    children may already have been cleared.
+
+    Attributes:
+        name: Key of the rule's result
+        files: Names of the files the rule applies to, or None for every XML file
+        tags: Clark-notation tags of the elements passed to visit(), or None for all
+            (rules with other criteria override wants() instead)
+        scopes: Tags whose open element counts visit() reads from open_scopes
+    """
+
+    name = None
+    files = None
+
+    def __init__(self, validator, xml_file):
+        self.validator = validator
+        self.xml_file = xml_file
+        self.tags = None
+        self.scopes = ()
+
+    def wants(self, tag):
+        """Check whether elements with this tag are passed to visit().
+
+        Asked once per distinct tag of a part, not once per element.
+        """
+        return self.tags is None or tag in self.tags
+
+    def visit_root(self, root):
+        """Inspect the root element before any element is visited.
+
+        Only the root's tag, attributes and namespace declarations are available.
+        """
+
+    def visit(self, elem, open_scopes):
+        """Inspect an element.
+
+        Args:
+            elem: Element in document order
+            open_scopes: Maps each tag in any rule's scopes to the number of
+                elements with that tag enclosing elem, elem itself included
+        """
+        raise NotImplementedError("Subclasses must implement the visit method")
+
+    def result(self):
+        """Return the rule's result for the part; it must not be modified later."""
+        raise NotImplementedError("Subclasses must implement the result method")
+
+
+def walk_rules(root, rules):
+    """Walk a tree once, sending each element to every rule that wants it."""
+    open_scopes = {}
+    for rule in rules:
+        open_scopes.update(dict.fromkeys(rule.scopes, 0))
+    events = ("start", "end") if open_scopes else ("start",)
+
+    for rule in rules:
+        rule.visit_root(root)
+
+    # Rules that want each tag, filled in as tags are first seen
+    dispatch = {}
+    for event, elem in lxml.etree.iterwalk(root, events=events):
+        tag = elem.tag
+        if tag in open_scopes:
+            open_scopes[tag] += 1 if event == "start" else -1
+        if event == "end":
+            continue
+
+        handlers = dispatch.get(tag)
+        if handlers is None:
+            handlers = dispatch[tag] = [rule for rule in rules if rule.wants(tag)]
+        for rule in handlers:
+            rule.visit(elem, open_scopes)
+
+
+def stream_rules(source, rules):
+    """Stream a part with iterparse once, sending each element to every rule that wants it.
+
+    Elements are visited when they end, with the counts of open scopes as they
+    were at their start, and are cleared once visited, so memory use does not
+    grow with the size of the part.
+
+    Args:
+        source: Path or binary file object of the part
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    open_scopes = {}
+    for rule in rules:
+        open_scopes.update(dict.fromkeys(rule.scopes, 0))
+
+    dispatch = {}
+    root = None
+    for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if root is None:
+                root = elem
+                for rule in rules:
+                    rule.visit_root(root)
+            if tag in open_scopes:
+                open_scopes[tag] += 1
+            continue
+
+        handlers = dispatch.get(tag)
+        if handlers is None:
+            handlers = dispatch[tag] = [rule for rule in rules if rule.wants(tag)]
+        for rule in handlers:
+            rule.visit(elem, open_scopes)
+        if tag in open_scopes:
+            open_scopes[tag] -= 1
+
+        # Drop the element's content and its already visited siblings
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+class RootNameRule(ElementRule):
+    """Get the local name of the root element."""
+
+    name = "root_name"
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = set()
+        self.root_name = None
+
+    def visit_root(self, root):
+        self.root_name = root.tag.split("}")[-1] if "}" in root.tag else root.tag
+
+    def result(self):
+        return self.root_name
+
+
+class IgnorableNamespaceRule(ElementRule):
+    """Find namespace prefixes in the root's Ignorable attributes that are not declared."""
+
+    name = "ignorable_namespaces"
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.tags = set()
+        self.path = xml_file.relative_to(validator.unpacked_dir)
+        self.errors = []
+
+    def visit_root(self, root):
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            self.errors.extend(
+                f"  {self.path}: Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+
+    def result(self):
+        return self.errors
+
+
+class RelationshipReferenceRule(ElementRule):
+    """
+    Collect the r:id references of a part.
+
+    The result is a list of (element_name, relationship_id, line) tuples in
+    document order.
+    """
+
+    name = "relationship_references"
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+        self.references = []
+
+    def visit(self, elem, open_scopes):
+        # Check for r:id attribute (relationship ID)
+        rid = elem.get(self.rid_attr)
+        if rid:
+            elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+            self.references.append((elem_name, rid, elem.sourceline))
+
+    def result(self):
+        return self.references
+
+
+class UniqueIdRule(ElementRule):
+    """
+    Collect the IDs that have uniqueness requirements (see UNIQUE_ID_REQUIREMENTS).
+
+    IDs inside mc:AlternateContent are left out. The result is a list of
+    (tag, attr_name, scope, id_value, line) tuples in document order.
+    """
+
+    name = "unique_ids"
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.alternate_content = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+        self.scopes = (self.alternate_content,)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.occurrences = []
+
+    @staticmethod
+    def _local_name(tag):
+        """Get the lowercase element or attribute name without namespace."""
+        return tag.split("}")[-1].lower()
+
+    def wants(self, tag):
+        # Only element types with ID uniqueness requirements
+        return self._local_name(tag) in self.requirements
+
+    def visit(self, elem, open_scopes):
+        if open_scopes[self.alternate_content]:
+            return
+
+        tag = self._local_name(elem.tag)
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        for attr, value in elem.attrib.items():
+            if self._local_name(attr) == attr_name:
+                self.occurrences.append((tag, attr_name, scope, value, elem.sourceline))
+                break
+
+    def result(self):
+        return self.occurrences
@@ -0,0 +1,19 @@
+"""
+Files the tools keep in an unpacked directory that are not parts of the package.
+
+They live in this module of their own so that the editors in scripts/ and the
+command line tools here can share them without importing each other.
+"""
+
+# Suffix of the temporary files parts are written to before being renamed into
+# place (see scripts/utilities.py); leftovers of an interrupted write are skipped
+PARTIAL_SUFFIX = ".partial"
+
+# File listing the parts unpack.py extracted with pretty="lazy" that are still
+# to be pretty-printed, with their content hashes (see unpack.pretty_print_pending)
+PENDING_PARTS_FILE = ".pretty_pending"
+
+
+def is_partial(part_file):
+    """Check whether a file is the temporary file of an interrupted part write."""
+    return part_file.name.startswith(".") and part_file.name.endswith(PARTIAL_SUFFIX)
@@ -27,15 +27,18 @@ Usage:
 """
 
 import html
+import os
 import random
 import shutil
 import tempfile
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.manifest import ValidationManifest
 from ooxml.scripts.validation.redlining import RedliningValidator
 
 from .utilities import XMLEditor
@@ -43,6 +46,9 @@ from .utilities import XMLEditor
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# ioctl request number for cloning a file's extents on Linux (FICLONE)
+_FICLONE = 0x40049409
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -52,12 +58,20 @@ class DocxXMLEditor(XMLEditor):
     - w:author and w:date (for w:ins, w:del, w:comment elements)
     - w:id (for w:ins and w:del elements)
 
+    Edits can be grouped with batch() so that all fragments are parsed together
+    and attributes are injected in a single pass when the batch ends.
+
     Attributes:
         dom (defusedxml.minidom.Document): The DOM document for direct manipulation
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        cache_dir=None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,17 +80,32 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            cache_dir: Optional parse cache directory (see XMLEditor)
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, cache_dir=cache_dir)
         self.rsid = rsid
         self.author = author
         self.initials = initials
 
+        # Edits queued by batch(): (method name, target element, XML, result list)
+        self._batch_edits = None
+        # Targets of the queued edits, those of them that are replaced, and the
+        # elements the edits put new content inside
+        self._batch_targets = None
+        self._batch_replaced = None
+        self._batch_containers = None
+
+        # w:id allocator for w:ins/w:del, seeded by one scan on first use
+        self._change_ids = _IdAllocator(self._get_next_change_id)
+
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
+        """Get the next available change ID by checking all tracked change elements.
+
+        Used once to seed the change ID allocator; later IDs come from the allocator.
+        """
         max_id = -1
         for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
+            elements = self._dom.getElementsByTagName(tag)
             for elem in elements:
                 change_id = elem.getAttribute("w:id")
                 if change_id:
@@ -86,9 +115,17 @@ class DocxXMLEditor(XMLEditor):
                         pass
         return max_id + 1
 
+    def _is_change_id_taken(self, elem, change_id):
+        """Check whether another w:ins or w:del in the document already uses a w:id."""
+        return any(
+            other is not elem
+            for tag in ("w:ins", "w:del")
+            for other in self._find_nodes(tag, attrs={"w:id": change_id})
+        )
+
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16du"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16du",
@@ -97,7 +134,7 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w16cex",
@@ -106,7 +143,7 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
+        root = self._dom.documentElement
         if not root.hasAttribute("xmlns:w14"):  # type: ignore
             root.setAttribute(  # type: ignore
                 "xmlns:w14",
@@ -120,7 +157,8 @@ class DocxXMLEditor(XMLEditor):
         - w:r: gets w:rsidR (or w:rsidDel if inside w:del)
         - w:p: gets w:rsidR, w:rsidRDefault, w:rsidP, w14:paraId, w14:textId
         - w:t: gets xml:space="preserve" if text has leading/trailing whitespace
-        - w:ins, w:del: get w:id, w:author, w:date, w16du:dateUtc
+        - w:ins, w:del: get w:id, w:author, w:date, w16du:dateUtc; a w:id that
+          another tracked change in the document already uses is replaced
         - w:comment: gets w:author, w:date, w:initials
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
@@ -131,6 +169,10 @@ class DocxXMLEditor(XMLEditor):
 
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+        # Change IDs handed out and brought in by fragments during this call
+        allocated_change_ids = []
+        explicit_change_ids = set()
+
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
             parent = elem.parentNode
@@ -155,9 +197,9 @@ class DocxXMLEditor(XMLEditor):
                 self._ensure_w14_namespace()
                 elem.setAttribute("w14:textId", _generate_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -165,9 +207,18 @@ class DocxXMLEditor(XMLEditor):
                     elem.setAttribute("w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
-            # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
+            # Auto-assign w:id if not present or already used by another change,
+            # and keep the allocator ahead of any w:id the fragment brought in itself
+            if not elem.hasAttribute("w:id") or self._is_change_id_taken(
+                elem, elem.getAttribute("w:id")
+            ):
+                change_id = self._change_ids.allocate()
+                elem.setAttribute("w:id", str(change_id))
+                allocated_change_ids.append((elem, change_id))
+            else:
+                change_id = self._change_ids.observe(elem.getAttribute("w:id"))
+                if change_id is not None:
+                    explicit_change_ids.add(change_id)
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
@@ -208,59 +259,216 @@ class DocxXMLEditor(XMLEditor):
             if node.nodeType != node.ELEMENT_NODE:
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
+            # Walk the subtree once in document order, carrying down whether we are
+            # inside a w:del instead of re-walking the ancestors of every w:r
+            stack = [(node, is_inside_deletion(node))]
+            while stack:
+                elem, inside_deletion = stack.pop()
+                tag = elem.tagName
+                if tag == "w:p":
+                    add_rsid_to_p(elem)
+                elif tag == "w:r":
+                    add_rsid_to_r(elem, inside_deletion)
+                elif tag == "w:t":
+                    add_xml_space_to_t(elem)
+                elif tag in ("w:ins", "w:del"):
                     add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
+                elif tag == "w:comment":
+                    add_comment_attrs(elem)
+                elif tag == "w16cex:commentExtensible":
+                    add_comment_extensible_date(elem)
+
+                inside_deletion = inside_deletion or tag == "w:del"
+                stack.extend(
+                    (child, inside_deletion)
+                    for child in reversed(elem.childNodes)
+                    if child.nodeType == child.ELEMENT_NODE
+                )
+
+        # An ID allocated before the walk reached a fragment's own copy of it collides
+        for elem, change_id in allocated_change_ids:
+            if change_id in explicit_change_ids:
+                elem.setAttribute("w:id", str(self._change_ids.allocate()))
 
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+        if self._batch_edits is not None:
+            return self._queue_edit("replace_node", elem, new_content)
+        return self._edit_now(super().replace_node, elem, new_content)
 
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+        if self._batch_edits is not None:
+            return self._queue_edit("insert_after", elem, xml_content)
+        return self._edit_now(super().insert_after, elem, xml_content)
 
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+        if self._batch_edits is not None:
+            return self._queue_edit("insert_before", elem, xml_content)
+        return self._edit_now(super().insert_before, elem, xml_content)
 
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
+        if self._batch_edits is not None:
+            return self._queue_edit("append_to", elem, xml_content)
+        return self._edit_now(super().append_to, elem, xml_content)
+
+    def _edit_now(self, edit, elem, xml_content):
+        """Apply an XMLEditor edit method right away and inject attributes into its nodes."""
+        nodes = edit(elem, xml_content)
         self._inject_attributes_to_nodes(nodes)
+        # Re-index with the injected attributes (e.g. w:id) so they are searchable
+        self._index_nodes(nodes)
         return nodes
 
+    @contextmanager
+    def batch(self):
+        """Group replace_node, insert_after, insert_before and append_to calls.
+
+        Edits made inside the block are queued and applied in order when the block
+        exits: all fragments are parsed with one wrapper parse, and RSIDs, change
+        IDs and timestamps are injected in a single walk over the new content.
+        If the block raises, no queued edit is applied.
+
+        Inside the block, the edit methods return placeholder lists that hold the
+        inserted nodes once the batch is applied; using one earlier raises
+        RuntimeError. get_node does not see queued edits yet, and targets must be
+        nodes that exist before the batch. Other methods (suggest_deletion,
+        revert_insertion, revert_deletion) still apply immediately. A batch opened
+        inside another one joins it, and its edits are applied when the outermost
+        block exits.
+
+        Raises:
+            ValueError: If a target was removed from the document, including by an
+                earlier replace_node in the same batch, or if replace_node,
+                suggest_deletion, revert_insertion or revert_deletion would
+                discard content queued by an earlier edit of the batch or change
+                a node it replaces
+
+        Example:
+            with editor.batch():
+                for node in runs:
+                    editor.replace_node(node, "<w:del>...</w:del><w:ins>...</w:ins>")
+        """
+        if self._batch_edits is not None:
+            # Joins the enclosing batch, which applies the edits
+            yield self
+            return
+        self._batch_edits = []
+        self._batch_targets = set()
+        self._batch_replaced = set()
+        self._batch_containers = set()
+        try:
+            yield self
+        finally:
+            edits, self._batch_edits = self._batch_edits, None
+            self._batch_targets = self._batch_replaced = self._batch_containers = None
+        self._apply_batch(edits)
+
+    def _queue_edit(self, method, elem, xml_content):
+        """Queue an edit for the current batch and return its placeholder result list.
+
+        Targets are checked here as well as when the batch is applied, so a bad
+        edit fails while the caller is still queuing.
+
+        Raises:
+            ValueError: If the target is not in the document or is inside an
+                element replaced earlier in the batch, or if a replace_node target
+                receives content from an earlier queued edit, which replacing it
+                would discard
+        """
+        self._check_batch_target(elem, self._batch_replaced)
+        if method == "replace_node" and elem in self._batch_containers:
+            raise ValueError(
+                f"Cannot replace <{elem.tagName}>: an earlier edit in the same batch "
+                f"inserts content inside it"
+            )
+        self._batch_targets.add(elem)
+        if method == "replace_node":
+            self._batch_replaced.add(elem)
+        # The element that receives the new content, and everything enclosing it
+        container = elem if method == "append_to" else elem.parentNode
+        while container is not None and container not in self._batch_containers:
+            self._batch_containers.add(container)
+            container = container.parentNode
+
+        result = _PendingNodes()
+        self._batch_edits.append((method, elem, xml_content, result))
+        return result
+
+    def _check_batch_conflict(self, elem):
+        """Refuse an immediate edit of elem that would move or discard queued batch content.
+
+        Raises:
+            ValueError: If elem is the target of, or contains, an edit queued in
+                the current batch, or is inside an element it replaces
+        """
+        if self._batch_edits is None:
+            return
+        if elem in self._batch_targets or elem in self._batch_containers:
+            raise ValueError(
+                f"<{elem.tagName}> is the target of, or contains, an edit queued in "
+                f"the current batch; edit it after the batch is applied"
+            )
+        node = elem.parentNode
+        while node is not None:
+            if node in self._batch_replaced:
+                raise ValueError(
+                    f"<{elem.tagName}> is inside an element replaced in the current "
+                    f"batch; edit it after the batch is applied"
+                )
+            node = node.parentNode
+
+    def _check_batch_target(self, elem, replaced):
+        """Check that a batch edit target is in the document and was not replaced.
+
+        Args:
+            elem: Target element of the edit
+            replaced: Targets of the replace_node edits queued before this one
+
+        Raises:
+            ValueError: If elem is not in the document, or is or is inside an
+                element in replaced
+        """
+        node = elem
+        while node is not None:
+            if node in replaced:
+                raise ValueError(
+                    f"Batch edit target <{elem.tagName}> is, or is inside, an element "
+                    f"replaced earlier in the same batch"
+                )
+            node = node.parentNode
+        if not self._is_attached(elem):
+            raise ValueError(f"Batch edit target <{elem.tagName}> is not in the document")
+
+    def _apply_batch(self, edits):
+        """Apply queued edits with one fragment parse and one attribute-injection pass."""
+        # Check every target again, as the tree may have been changed directly
+        # since the edits were queued, so that a bad edit leaves it untouched
+        replaced = set()
+        for method, elem, _, _ in edits:
+            self._check_batch_target(elem, replaced)
+            if method == "replace_node":
+                replaced.add(elem)
+
+        placements = {
+            "replace_node": self._replace_with_nodes,
+            "insert_after": self._insert_nodes_after,
+            "insert_before": self._insert_nodes_before,
+            "append_to": self._append_nodes,
+        }
+        parsed = self._parse_fragments([xml_content for _, _, xml_content, _ in edits])
+        all_nodes = []
+        for (method, elem, _, result), nodes in zip(edits, parsed):
+            placements[method](elem, nodes)
+            result._fill(nodes)
+            all_nodes.extend(nodes)
+
+        self._inject_attributes_to_nodes(all_nodes)
+        # Re-index with the injected attributes (e.g. w:id) so they are searchable
+        self._index_nodes(all_nodes)
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -274,7 +482,8 @@ class DocxXMLEditor(XMLEditor):
             list: List containing the processed element(s)
 
         Raises:
-            ValueError: If the element contains no w:ins elements
+            ValueError: If the element contains no w:ins elements, or is, contains
+                or is inside the target of an edit queued in the current batch
 
         Example:
             # Reject a single insertion
@@ -285,6 +494,8 @@ class DocxXMLEditor(XMLEditor):
             para = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
             doc["word/document.xml"].revert_insertion(para)
         """
+        self._check_batch_conflict(elem)
+
         # Collect insertions
         ins_elements = []
         if elem.tagName == "w:ins":
@@ -306,7 +517,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
 
             # Process each run
             for run in runs:
@@ -318,7 +529,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
                 for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
+                    del_text = self._dom.createElement("w:delText")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while t_elem.firstChild:
                         del_text.appendChild(t_elem.firstChild)
@@ -336,6 +547,8 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.mark_modified()
+            self._index_nodes([del_wrapper])
 
         return [elem]
 
@@ -353,7 +566,8 @@ class DocxXMLEditor(XMLEditor):
             list: If elem is w:del, returns [elem, new_ins]. Otherwise returns [elem].
 
         Raises:
-            ValueError: If the element contains no w:del elements
+            ValueError: If the element contains no w:del elements, or is, contains
+                or is inside the target of an edit queued in the current batch
 
         Example:
             # Reject a single deletion - returns [w:del, w:ins]
@@ -364,6 +578,8 @@ class DocxXMLEditor(XMLEditor):
             para = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
             nodes = doc["word/document.xml"].revert_deletion(para)
         """
+        self._check_batch_conflict(elem)
+
         # Collect deletions FIRST - before we modify the DOM
         del_elements = []
         is_single_del = elem.tagName == "w:del"
@@ -391,7 +607,7 @@ class DocxXMLEditor(XMLEditor):
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._dom.createElement("w:ins")
 
             for run in runs:
                 # Clone the run
@@ -399,7 +615,7 @@ class DocxXMLEditor(XMLEditor):
 
                 # Convert w:delText → w:t
                 for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
+                    t_elem = self._dom.createElement("w:t")
                     # Copy ALL child nodes (not just firstChild) to handle entities
                     while del_text.firstChild:
                         t_elem.appendChild(del_text.firstChild)
@@ -417,8 +633,8 @@ class DocxXMLEditor(XMLEditor):
 
                 ins_elem.appendChild(new_run)
 
-            # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            # Insert the new insertion after the deletion, at once even in a batch
+            nodes = self._edit_now(super().insert_after, del_elem, ins_elem.toxml())
 
             # If processing a single w:del, track the created insertion
             if is_single_del and nodes:
@@ -493,8 +709,12 @@ class DocxXMLEditor(XMLEditor):
             Element: The modified element
 
         Raises:
-            ValueError: If element has existing tracked changes or invalid structure
+            ValueError: If element has existing tracked changes or invalid structure,
+                or is, contains or is inside the target of an edit queued in the
+                current batch
         """
+        self._check_batch_conflict(elem)
+
         if elem.nodeName == "w:r":
             # Check for existing w:delText
             if elem.getElementsByTagName("w:delText"):
@@ -502,7 +722,7 @@ class DocxXMLEditor(XMLEditor):
 
             # Convert w:t → w:delText
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -520,7 +740,7 @@ class DocxXMLEditor(XMLEditor):
                 elem.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             parent = elem.parentNode
             parent.insertBefore(del_wrapper, elem)
             parent.removeChild(elem)
@@ -528,6 +748,8 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.mark_modified()
+            self._index_nodes([del_wrapper])
 
             return del_wrapper
 
@@ -546,20 +768,20 @@ class DocxXMLEditor(XMLEditor):
                 rPr_list = pPr.getElementsByTagName("w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
+                    rPr = self._dom.createElement("w:rPr")
                     pPr.appendChild(rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
+                del_marker = self._dom.createElement("w:del")
                 rPr.insertBefore(
                     del_marker, rPr.firstChild
                 ) if rPr.firstChild else rPr.appendChild(del_marker)
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
+                del_text = self._dom.createElement("w:delText")
                 # Copy ALL child nodes (not just firstChild) to handle entities
                 while t_elem.firstChild:
                     del_text.appendChild(t_elem.firstChild)
@@ -578,7 +800,7 @@ class DocxXMLEditor(XMLEditor):
                     run.setAttribute("w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._dom.createElement("w:del")
             for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
                 elem.removeChild(child)
                 del_wrapper.appendChild(child)
@@ -586,6 +808,8 @@ class DocxXMLEditor(XMLEditor):
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self.mark_modified()
+            self._index_nodes([elem])
 
             return elem
 
@@ -593,6 +817,124 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+class _IdAllocator:
+    """Monotonic allocator for integer IDs such as tracked change w:id values.
+
+    Seeded lazily by one call to `scan`, which returns the next free ID. After
+    that, allocate() and observe() are O(1), so allocation cost does not grow
+    with the number of IDs already in the document.
+    """
+
+    def __init__(self, scan):
+        """
+        Args:
+            scan: Callable returning the next free ID, called once on first use
+        """
+        self._scan = scan
+        self._next = None
+
+    def allocate(self) -> int:
+        """Return a fresh ID and advance the allocator."""
+        if self._next is None:
+            self._next = self._scan()
+        allocated = self._next
+        self._next += 1
+        return allocated
+
+    def observe(self, value):
+        """Record an ID that is in use so it is never allocated.
+
+        Args:
+            value: ID as found in the XML (str or int); non-integers are ignored
+
+        Returns:
+            int or None: The parsed ID, or None if value is not an integer
+        """
+        try:
+            observed = int(value)
+        except ValueError:
+            return None
+        if self._next is None:
+            self._next = self._scan()
+        self._next = max(self._next, observed + 1)
+        return observed
+
+
+class _PendingNodes(list):
+    """Result list of an edit queued by DocxXMLEditor.batch().
+
+    Holds the inserted nodes once the batch has been applied. Reading it before
+    then raises RuntimeError instead of looking like an edit that inserted nothing.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.applied = False
+
+    def _fill(self, nodes):
+        self.extend(nodes)
+        self.applied = True
+
+    def _check_applied(self):
+        if not self.applied:
+            raise RuntimeError(
+                "The nodes of a batched edit are available once the batch is applied"
+            )
+
+    def __len__(self):
+        self._check_applied()
+        return super().__len__()
+
+    def __iter__(self):
+        self._check_applied()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self._check_applied()
+        return super().__reversed__()
+
+    def __getitem__(self, index):
+        self._check_applied()
+        return super().__getitem__(index)
+
+    def __contains__(self, node):
+        self._check_applied()
+        return super().__contains__(node)
+
+    def __repr__(self):
+        return super().__repr__() if self.applied else "<nodes of a pending batch edit>"
+
+
+def _reflink_or_copy(src, dst):
+    """copytree copy_function that shares file data with src where possible.
+
+    Tries a reflink, an independent file that shares extents with src until
+    either is written, and falls back to a regular copy on filesystems without
+    reflinks. Hardlinks are never used: a write to a hardlinked file, in place
+    or by any other tool, would reach the original.
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        return dst
+    except (ImportError, OSError):
+        if os.path.lexists(dst):
+            os.unlink(dst)
+    return shutil.copy2(src, dst)
+
+
+def _file_signature(path):
+    """Cheap change signature for a file: (size, inode, mtime and ctime in ns).
+
+    Parts are replaced by renaming a new file over them, which changes the
+    inode even when size and mtime stay the same within one clock tick.
+    """
+    stat = path.stat()
+    return stat.st_size, stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -619,17 +961,30 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        copy_on_write=False,
+        cache_dir=None,
     ):
         """
         Initialize with path to unpacked Word document directory.
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
+        With copy_on_write=True the working copy reflinks the original parts
+        where the filesystem supports it (and copies them otherwise), the
+        validation baseline is only packed when it is first needed, and save()
+        back to the original directory writes just the parts that changed. A
+        reflinked part is an independent file, so the original files stay
+        untouched until save() however the working copy is written.
+
         Args:
             unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            copy_on_write: If True, reflink unchanged parts from the original
+                directory instead of copying them (default: False)
+            cache_dir: Optional directory for a parse cache keyed by file content, so
+                reopening unchanged parts in later sessions skips XML parsing
         """
         self.original_path = Path(unpacked_dir)
 
@@ -639,11 +994,24 @@ class Document:
         # Create temporary directory with subdirectories for unpacked content and baseline
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self.copy_on_write = copy_on_write
+        if copy_on_write:
+            shutil.copytree(
+                self.original_path, self.unpacked_path, copy_function=_reflink_or_copy
+            )
+            # Remember what each part looked like so save() can skip unchanged ones
+            self._part_signatures = {
+                path.relative_to(self.unpacked_path): _file_signature(path)
+                for path in self.unpacked_path.rglob("*")
+                if path.is_file()
+            }
+        else:
+            shutil.copytree(self.original_path, self.unpacked_path)
 
         # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        self._original_docx = Path(self.temp_dir) / "original.docx"
+        if not copy_on_write:
+            pack_document(self.original_path, self._original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
 
@@ -655,8 +1023,17 @@ class Document:
         self.author = author
         self.initials = initials
 
-        # Cache for lazy-loaded editors
+        # Cache for lazy-loaded editors, optionally backed by an on-disk parse cache
         self._editors = {}
+        self.cache_dir = cache_dir
+
+        # Working copy state (see _tree_state) that last passed validation, and
+        # the state last copied to each destination
+        self._validated_state = None
+        self._synced_states = {}
+
+        # Per-part facts of earlier validations, so validate() only re-checks changed parts
+        self._validation_manifest = ValidationManifest()
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -706,7 +1083,11 @@ class Document:
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                cache_dir=self.cache_dir,
             )
         return self._editors[xml_path]
 
@@ -727,39 +1108,12 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
+        comment_id = self._allocate_comment_id()
         para_id = _generate_hex_id()
         durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
-
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
-
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
-
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
-
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
-
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
-
-        self.next_comment_id += 1
+        self._anchor_comment(comment_id, start, end)
+        self._add_comment_parts(comment_id, para_id, durable_id, text, None)
         return comment_id
 
     def reply_to_comment(
@@ -784,12 +1138,149 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
+        comment_id = self._allocate_comment_id()
         para_id = _generate_hex_id()
         durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Add comment ranges to document.xml immediately
+        self._anchor_reply(comment_id, parent_comment_id)
+        self._add_comment_parts(
+            comment_id, para_id, durable_id, text, parent_info["para_id"]
+        )
+        return comment_id
+
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments and replies with batched edits.
+
+        Every anchor and parent is checked while the comment IDs, para IDs and
+        durable IDs are planned, before anything is written. Comments are then
+        written with one batch per part, so each part gets one fragment parse
+        and one attribute-injection pass instead of one per comment; a round's
+        batches are applied only once all of its edits are queued. Replies to
+        comments added in the same call are written in a following round, once
+        their parent's markup is in place.
+
+        Args:
+            comments: Iterable of (start, end, text, parent) tuples. For a new
+                comment, parent is None and start/end are the DOM elements of
+                word/document.xml to anchor it to, as in add_comment(). For a
+                reply, parent is the w:id of the parent comment (existing or added
+                earlier in the same call) and start/end are ignored.
+
+        Returns:
+            List of the created comment IDs, in input order
+
+        Raises:
+            ValueError: If a parent comment or its markup does not exist, an
+                anchor is not in word/document.xml, or replies to comments of the
+                same call are added inside an open batch of word/document.xml.
+                Nothing is added and no comment ID is used up then.
+
+        Example:
+            ids = doc.add_comments([
+                (node, node, "Check this figure", None),
+                (None, None, "Figure updated", 0),
+            ])
+        """
+        # Plan everything up front; rounds[n] holds comments whose parent
+        # was written in round n - 1 (or already existed, for round 0)
+        planned = {}
+        rounds = []
+        comment_ids = []
+        next_comment_id = self.next_comment_id
+        try:
+            for start, end, text, parent in comments:
+                if parent is None:
+                    for anchor in (start, end):
+                        if anchor is None or not self._document._is_attached(anchor):
+                            raise ValueError(
+                                "Comment anchor is not an element of word/document.xml"
+                            )
+                    depth = 0
+                elif parent in self.existing_comments:
+                    # Replies are anchored next to their parent's markup
+                    for tag in ("w:commentRangeStart", "w:commentReference"):
+                        self._document.get_node(tag=tag, attrs={"w:id": str(parent)})
+                    depth = 0
+                elif parent in planned:
+                    depth = planned[parent]["depth"] + 1
+                else:
+                    raise ValueError(f"Parent comment with id={parent} not found")
+                comment_id = self._allocate_comment_id()
+                planned[comment_id] = {
+                    "depth": depth,
+                    "para_id": _generate_hex_id(),
+                    "durable_id": _generate_hex_id(),
+                }
+                if depth == len(rounds):
+                    rounds.append([])
+                rounds[depth].append((comment_id, start, end, text, parent))
+                comment_ids.append(comment_id)
+            if len(rounds) > 1 and self._document._batch_edits is not None:
+                # Later rounds look up markup that the open batch has not applied
+                raise ValueError(
+                    "Replies to comments added in the same call cannot be written "
+                    "inside an open batch of word/document.xml"
+                )
+        except ValueError:
+            self.next_comment_id = next_comment_id
+            raise
+
+        if not comment_ids:
+            return comment_ids
+
+        self._ensure_comment_parts()
+        # document.xml is entered last so its batch, the only one whose targets
+        # can be stale, is applied first; if it raises, the others are dropped
+        editors = [
+            self["word/comments.xml"],
+            self["word/commentsExtended.xml"],
+            self["word/commentsIds.xml"],
+            self["word/commentsExtensible.xml"],
+            self._document,
+        ]
+        for round_comments in rounds:
+            try:
+                with ExitStack() as stack:
+                    for editor in editors:
+                        stack.enter_context(editor.batch())
+                    for comment_id, start, end, text, parent in round_comments:
+                        info = planned[comment_id]
+                        if parent is None:
+                            self._anchor_comment(comment_id, start, end)
+                            parent_para_id = None
+                        else:
+                            self._anchor_reply(comment_id, parent)
+                            parent_para_id = self.existing_comments[parent]["para_id"]
+                        self._add_comment_parts(
+                            comment_id,
+                            info["para_id"],
+                            info["durable_id"],
+                            text,
+                            parent_para_id,
+                        )
+            except BaseException:
+                # The round's batches were dropped; so are the comments it recorded
+                for comment_id, *_ in round_comments:
+                    self.existing_comments.pop(comment_id, None)
+                if round_comments is rounds[0]:
+                    self.next_comment_id = next_comment_id
+                raise
+        return comment_ids
+
+    def _anchor_comment(self, comment_id, start, end):
+        """Add comment range markers and the reference run for a new comment to document.xml."""
+        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+
+        # If end node is a paragraph, append comment markup inside it
+        # Otherwise insert after it (for run-level anchors)
+        if end.tagName == "w:p":
+            self._document.append_to(end, self._comment_range_end_xml(comment_id))
+        else:
+            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+
+    def _anchor_reply(self, comment_id, parent_comment_id):
+        """Add range markers and the reference run for a reply next to its parent's."""
         parent_start_elem = self._document.get_node(
             tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
         )
@@ -808,46 +1299,57 @@ class Document:
             parent_ref_run, self._comment_ref_run_xml(comment_id)
         )
 
-        # Add to comments.xml immediately
+    def _add_comment_parts(self, comment_id, para_id, durable_id, text, parent_para_id):
+        """Add a comment to comments.xml and its companion parts, and record it for replies."""
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
         self._add_to_comments_xml(
             comment_id, para_id, text, self.author, self.initials, timestamp
         )
-
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
-
-        # Add to commentsIds.xml immediately
+        self._add_to_comments_extended_xml(para_id, parent_para_id=parent_para_id)
         self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
         self._add_to_comments_extensible_xml(durable_id)
 
         # Update existing_comments so replies work
         self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
-        return comment_id
-
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
+    @property
+    def original_docx(self) -> Path:
+        """Packed copy of the original directory used as the validation baseline.
+
+        Packed in __init__ by default, or on first access with copy_on_write.
+        """
+        if not self._original_docx.exists():
+            pack_document(self.original_path, self._original_docx, validate=False)
+        return self._original_docx
+
     def validate(self) -> None:
         """
         Validate the document against XSD schema and redlining rules.
 
+        Per-part results are kept between calls, so parts that did not change
+        since the previous validation are not parsed or checked again.
+
         Raises:
             ValueError: If validation fails.
         """
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            manifest=self._validation_manifest,
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            authors=[self.author],
         )
 
         # Run validations
@@ -861,6 +1363,11 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only editors whose tree may have changed are written (see
+        XMLEditor.save_if_changed). Validation and the copy are skipped when no
+        file of the working copy changed since they last ran, judged by the
+        size, inode and change times of every file, so files added to or
+        replaced in the working copy directly are always picked up.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
@@ -871,20 +1378,68 @@ class Document:
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
+        # Save modified XML files in temp directory
         for editor in self._editors.values():
-            editor.save()
+            editor.save_if_changed()
+        state = self._tree_state()
 
-        # Validate by default
-        if validate:
+        # Validate by default, unless this exact working copy already passed
+        if validate and state != self._validated_state:
             self.validate()
+            self._validated_state = state
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        target_key = target_path.resolve()
+        if self._synced_states.get(target_key) == state:
+            return
+        if self.copy_on_write and target_path.resolve() == self.original_path.resolve():
+            # Pack the baseline while the original files are still unmodified
+            self.original_docx
+            self._write_back_changed_parts()
+        else:
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        self._synced_states[target_key] = state
+
+    def _tree_state(self):
+        """Get the (relative path, signature) pairs of every file in the working copy."""
+        return frozenset(
+            (path.relative_to(self.unpacked_path), _file_signature(path))
+            for path in self.unpacked_path.rglob("*")
+            if path.is_file()
+        )
+
+    def _write_back_changed_parts(self):
+        """Copy parts that are new or changed since the last write-back to the original."""
+        for path in self.unpacked_path.rglob("*"):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(self.unpacked_path)
+            signature = _file_signature(path)
+            if self._part_signatures.get(relative) == signature:
+                continue
+            target = self.original_path / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            self._part_signatures[relative] = signature
 
     # ==================== Private: Initialization ====================
 
+    def _allocate_comment_id(self):
+        """Return the next free comment ID and advance next_comment_id.
+
+        next_comment_id is seeded by one scan of comments.xml at load time. Comment
+        IDs that fragments brought into comments.xml since then are skipped with
+        indexed lookups instead of rescanning the file.
+        """
+        comment_id = self.next_comment_id
+        if self.comments_path.exists():
+            editor = self["word/comments.xml"]
+            while editor._find_nodes("w:comment", attrs={"w:id": str(comment_id)}):
+                comment_id += 1
+        self.next_comment_id = comment_id + 1
+        return comment_id
+
     def _get_next_comment_id(self):
         """Get the next available comment ID."""
         if not self.comments_path.exists():
@@ -892,7 +1447,7 @@ class Document:
 
         editor = self["word/comments.xml"]
         max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if comment_id:
                 try:
@@ -909,7 +1464,7 @@ class Document:
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -965,7 +1520,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,7 +1531,7 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
@@ -1004,7 +1559,7 @@ class Document:
         if track_revisions:
             track_revisions_exists = any(
                 elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1012,7 +1567,7 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1025,7 +1580,7 @@ class Document:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor._dom.getElementsByTagName(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,13 +1591,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor._dom.getElementsByTagName(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
+                clr_elements = editor._dom.getElementsByTagName(
                     f"{prefix}:clrSchemeMapping"
                 )
                 if clr_elements:
@@ -1065,6 +1620,17 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
+    def _ensure_comment_parts(self):
+        """Create any missing comment part from its template."""
+        for path in (
+            self.comments_path,
+            self.comments_extended_path,
+            self.comments_ids_path,
+            self.comments_extensible_path,
+        ):
+            if not path.exists():
+                shutil.copy(TEMPLATE_DIR / path.name, path)
+
     def _add_to_comments_xml(
         self, comment_id, para_id, text, author, initials, timestamp
     ):
@@ -1159,21 +1725,21 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
+        for rel_elem in editor._dom.getElementsByTagName("Relationship"):
             if rel_elem.getAttribute("Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
+        for override_elem in editor._dom.getElementsByTagName("Override"):
             if override_elem.getAttribute("PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
+        for person_elem in editor._dom.getElementsByTagName("w15:person"):
             if person_elem.getAttribute("w15:author") == author:
                 return True
         return False
@@ -1207,7 +1773,7 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
@@ -1247,7 +1813,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
 
         # Add Override elements
         overrides = [
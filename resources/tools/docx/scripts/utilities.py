@@ -28,14 +28,40 @@ Example usage:
 
     # Save changes
     editor.save()
+
+    # Use the lxml engine instead of minidom (returns lxml elements)
+    editor = XMLEditor("document.xml", engine="lxml")
 """
 
+import gc
+import hashlib
 import html
+import io
+import marshal
+import os
+import secrets
+import sys
+import xml.dom.minidom
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Union
 
+import defusedxml
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+from ooxml.scripts.workfiles import PARTIAL_SUFFIX, PENDING_PARTS_FILE
+
+# Parsing engines accepted by XMLEditor
+ENGINES = ("minidom", "lxml")
+
+# Bumped whenever the layout of parse cache entries changes
+_PARSE_CACHE_VERSION = 1
+
+# Total size of parse cache entries kept in a cache directory; the least
+# recently used entries are evicted beyond it
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
 
 class XMLEditor:
@@ -50,28 +76,103 @@ class XMLEditor:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        modified: True once the tree has been changed through this editor and
+            not saved since
+
+    Changes made directly on nodes obtained from `dom` or get_node are not
+    tracked by `modified`; save_if_changed still finds them by comparing the
+    serialized tree with the file.
+
+    Lookups go through an index of the tree that is built on the first get_node
+    call and kept current by replace_node, insert_after, insert_before and
+    append_to. The index also caches the text of elements searched with
+    `contains`; matches are checked against the live text, and a search that
+    finds nothing is repeated on it. Nodes removed through `dom` directly are
+    filtered out on lookup; after adding nodes or changing attributes through
+    `dom`, call reindex() so lookups by attribute value see them.
+
+    Parts that unpack_document extracted with pretty="lazy" are pretty-printed
+    when an editor first opens them, so line numbers match the formatted file.
+
+    Setting ngram_index to True adds a trigram index over element text, which
+    narrows `contains` searches down before any substring test. It costs memory
+    proportional to the text of the searched tags, so it pays off for very large
+    documents with many `contains` lookups.
+
+    Passing engine="lxml" returns an LxmlXMLEditor, which offers the same API
+    on an lxml tree.
+
+    Passing cache_dir keeps a parse cache there, keyed by a hash of the file
+    content and the exact Python version. Reopening an unchanged file rebuilds
+    the DOM, its line positions and the tag index from the cache instead of
+    running the XML parser. Entries are marshal data, so the directory must
+    only be writable by trusted users; it is kept under PARSE_CACHE_MAX_BYTES
+    by evicting the least recently used entries.
     """
 
-    def __init__(self, xml_path):
+    # Whether get_node(contains=...) uses a trigram index over element text
+    ngram_index = False
+
+    def __new__(cls, *args, engine="minidom", **kwargs):
+        if engine == "lxml" and cls is XMLEditor:
+            cls = LxmlXMLEditor
+        return super().__new__(cls)
+
+    def __init__(self, xml_path, engine="minidom", cache_dir=None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
+            engine: Parsing engine, "minidom" (default) or "lxml"
+            cache_dir: Optional directory for the parse cache (str or Path)
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the engine is unknown
         """
+        if engine != "minidom":
+            raise ValueError(
+                f"Unsupported engine for {type(self).__name__}: {engine} "
+                f"(expected one of {', '.join(ENGINES)})"
+            )
+
         self.xml_path = Path(xml_path)
         if not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
+        # Parts unpacked with pretty="lazy" are pretty-printed on first open
+        _pretty_print_if_pending(self.xml_path)
 
         with open(self.xml_path, "rb") as f:
             header = f.read(200).decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        # Lookup index for get_node, built on first use
+        self._index = None
+        self.modified = False
+        # Whether nodes were handed out, so the tree may have changed untracked
+        self._exposed = False
+
+        if cache_dir is None:
+            parser = _create_line_tracking_parser()
+            self._dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+            return
+
+        content = self.xml_path.read_bytes()
+        cache_path = _parse_cache_path(cache_dir, content)
+        cached = _load_cached_dom(cache_path)
+        if cached is not None:
+            self._dom, by_tag = cached
+            self._index = _NodeIndex(self, by_tag)
+        else:
+            parser = _create_line_tracking_parser()
+            self._dom = defusedxml.minidom.parse(io.BytesIO(content), parser)
+            _store_cached_dom(cache_path, self._dom)
+
+    @property
+    def dom(self):
+        """The parsed tree. Changes made on it are found by save_if_changed."""
+        self._exposed = True
+        return self._dom
 
     def get_node(
         self,
@@ -109,40 +210,7 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        matches = self._find_nodes(tag, attrs, line_number, contains)
 
         if not matches:
             # Build descriptive error message
@@ -178,8 +246,187 @@ class XMLEditor:
                 f"Multiple nodes found: <{tag}>. "
                 f"Add more filters (attrs, line_number, or contains) to narrow the search."
             )
+        self._exposed = True
         return matches[0]
 
+    def _find_nodes(self, tag, attrs=None, line_number=None, contains=None):
+        """
+        Find all elements matching the get_node filters.
+
+        Takes the same arguments as get_node, but returns every match (possibly
+        none) instead of requiring exactly one.
+
+        Returns:
+            list: Matching elements in no particular order
+        """
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        candidates = self._get_candidates(tag, attrs, line_number, normalized_contains)
+        matches = self._filter_nodes(
+            candidates, attrs, line_number, normalized_contains, self._index.text_of
+        )
+        if normalized_contains is not None:
+            # Text changed through `dom` directly is not in the cached text: check
+            # the matches against the tree, and search it afresh if none is left
+            matches = [
+                elem
+                for elem in matches
+                if normalized_contains in self._index.refresh_text(elem)
+            ]
+            if not matches:
+                matches = self._filter_nodes(
+                    self._get_candidates(tag, attrs, line_number),
+                    attrs,
+                    line_number,
+                    normalized_contains,
+                    self._index.refresh_text,
+                )
+        return matches
+
+    def _filter_nodes(self, candidates, attrs, line_number, contains, text_of):
+        """Return the candidates that are in the document and pass every filter."""
+        matches = []
+        for elem in candidates:
+            # Skip stale index entries for nodes no longer in the document
+            if not self._is_attached(elem):
+                continue
+
+            # Check line_number filter
+            if line_number is not None:
+                elem_line = self._get_line(elem)
+
+                # Handle both single line number and range
+                if isinstance(line_number, range):
+                    if elem_line not in line_number:
+                        continue
+                else:
+                    if elem_line != line_number:
+                        continue
+
+            # Check attrs filter
+            if attrs is not None:
+                if not all(
+                    self._get_attribute(elem, attr_name) == attr_value
+                    for attr_name, attr_value in attrs.items()
+                ):
+                    continue
+
+            # Check contains filter
+            if contains is not None:
+                if contains not in text_of(elem):
+                    continue
+
+            # If all applicable filters passed, this is a match
+            matches.append(elem)
+
+        return matches
+
+    def _get_candidates(self, tag, attrs, line_number, contains=None):
+        """
+        Get the indexed elements that may match a get_node query.
+
+        Uses the narrowest available index: the smallest (tag, attribute, value)
+        bucket when attrs are given, otherwise the elements of the tag within
+        the requested lines, otherwise the trigram matches for `contains` when
+        ngram_index is enabled, otherwise all elements of the tag. Candidates
+        still have to pass every filter in get_node.
+
+        Returns:
+            list: Candidate elements (may include nodes no longer in the document)
+        """
+        if self._index is None:
+            self._index = _NodeIndex(self)
+
+        if attrs:
+            return min(
+                (
+                    self._index.with_attr(tag, attr_name, attr_value)
+                    for attr_name, attr_value in attrs.items()
+                ),
+                key=len,
+            )
+        if line_number is not None:
+            lines = line_number if isinstance(line_number, range) else [line_number]
+            if not lines:
+                return []
+            return self._index.in_lines(tag, min(lines), max(lines))
+        if contains is not None and self.ngram_index:
+            return self._index.containing(tag, contains)
+        return self._index.with_tag(tag)
+
+    def mark_modified(self):
+        """Flag the tree as changed, so the next save_if_changed writes it."""
+        self.modified = True
+        # Edits return their nodes, which may be changed directly later
+        self._exposed = True
+
+    def reindex(self, node=None):
+        """
+        Update the lookup index after changing the tree through `dom` directly.
+
+        get_node finds most such changes by itself; this makes sure lookups by
+        attribute value and the text of enclosing elements are current too.
+
+        Args:
+            node: Element that was added or changed, or the parent of a removed
+                one. If omitted, the whole index is rebuilt on the next lookup.
+        """
+        if node is None:
+            self._index = None
+        else:
+            self._index_nodes([node])
+
+    def _index_nodes(self, nodes):
+        """Add nodes and their descendants to the lookup index, if it has been built."""
+        if self._index is not None:
+            self._index.add(nodes)
+
+    def _unindex_node(self, node):
+        """Remove a node and its descendants from the lookup index, if it has been built.
+
+        Must be called while the node is still attached, so the cached text of
+        its ancestors is dropped too.
+        """
+        if self._index is not None:
+            self._index.remove(node)
+
+    def _is_attached(self, node):
+        """Check whether a node is still part of this editor's document."""
+        while node.parentNode is not None:
+            node = node.parentNode
+        return node is self._dom
+
+    def _get_root(self):
+        """Get the root element of the document."""
+        return self._dom.documentElement
+
+    def _get_parent_element(self, node):
+        """Get the parent element of a node, or None at the root or when detached."""
+        parent = node.parentNode
+        if parent is None or parent.nodeType != parent.ELEMENT_NODE:
+            return None
+        return parent
+
+    def _iter_elements(self, node):
+        """Return a node and its descendant elements, or nothing for non-element nodes."""
+        if node.nodeType != node.ELEMENT_NODE:
+            return []
+        return [node, *node.getElementsByTagName("*")]
+
+    def _get_tag(self, elem):
+        """Get the qualified tag name of an element as written in the file (e.g. "w:p")."""
+        return elem.tagName
+
+    def _get_attribute(self, elem, attr_name):
+        """Get an attribute by qualified name, or "" if it is not set."""
+        return elem.getAttribute(attr_name)
+
+    def _get_line(self, elem):
+        """Get the line an element started on in the original file, or None for new nodes."""
+        return getattr(elem, "parse_position", (None,))[0]
+
     def _get_element_text(self, elem):
         """
         Recursively extract all text content from an element.
@@ -217,11 +464,8 @@ class XMLEditor:
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
+        self._replace_with_nodes(elem, nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -238,14 +482,8 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+        self._insert_nodes_after(elem, nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -262,10 +500,8 @@ class XMLEditor:
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
+        self._insert_nodes_before(elem, nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -283,14 +519,50 @@ class XMLEditor:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
         nodes = self._parse_fragment(xml_content)
+        self._append_nodes(elem, nodes)
+        return nodes
+
+    def _replace_with_nodes(self, elem, nodes):
+        """Put already imported nodes in place of a DOM element and update the index."""
+        self.mark_modified()
+        parent = elem.parentNode
+        self._unindex_node(elem)
+        for node in nodes:
+            parent.insertBefore(node, elem)
+        parent.removeChild(elem)
+        self._index_nodes(nodes)
+
+    def _insert_nodes_after(self, elem, nodes):
+        """Insert already imported nodes after a DOM element and update the index."""
+        self.mark_modified()
+        parent = elem.parentNode
+        next_sibling = elem.nextSibling
+        for node in nodes:
+            if next_sibling:
+                parent.insertBefore(node, next_sibling)
+            else:
+                parent.appendChild(node)
+        self._index_nodes(nodes)
+
+    def _insert_nodes_before(self, elem, nodes):
+        """Insert already imported nodes before a DOM element and update the index."""
+        self.mark_modified()
+        parent = elem.parentNode
+        for node in nodes:
+            parent.insertBefore(node, elem)
+        self._index_nodes(nodes)
+
+    def _append_nodes(self, elem, nodes):
+        """Append already imported nodes as children of a DOM element and update the index."""
+        self.mark_modified()
         for node in nodes:
             elem.appendChild(node)
-        return nodes
+        self._index_nodes(nodes)
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
+        for rel_elem in self._dom.getElementsByTagName("Relationship"):
             rel_id = rel_elem.getAttribute("Id")
             if rel_id.startswith("rId"):
                 try:
@@ -304,10 +576,46 @@ class XMLEditor:
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8). The output is streamed
+        to a temporary file next to the target and renamed over it, so the whole
+        document is never held in memory as bytes and an interrupted save leaves
+        the previous file intact.
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        with _atomic_write(self.xml_path) as f:
+            self._serialize(f)
+        self.modified = False
+
+    def save_if_changed(self):
+        """
+        Save the tree if it may differ from the file.
+
+        Trees changed through the editor's methods are written. Trees whose nodes
+        were handed out through `dom` or get_node may have been changed directly,
+        so they are serialized into a hash and written only if it differs from
+        the file's. Trees that were only parsed are left alone.
+
+        Returns:
+            bool: True if the file was written
+        """
+        if not self.modified:
+            if not self._exposed:
+                return False
+            sink = _HashingWriter()
+            self._serialize(sink)
+            if sink.hash.digest() == _file_digest(self.xml_path):
+                return False
+        self.save()
+        return True
+
+    def _serialize(self, f):
+        """Write the serialized tree to a binary file object."""
+        # Same writer settings as toxml(encoding=...), without the in-memory buffer
+        writer = io.TextIOWrapper(
+            f, encoding=self.encoding, errors="xmlcharrefreplace", newline="\n"
+        )
+        self._dom.writexml(writer, "", "", "", self.encoding)
+        writer.flush()
+        writer.detach()
 
     def _parse_fragment(self, xml_content):
         """
@@ -322,8 +630,26 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, xml_contents):
+        """
+        Parse several XML fragments with a single parse and import them.
+
+        Each fragment is wrapped in its own <fragment> element inside one wrapper
+        document, so the cost of parsing and importing is paid once.
+
+        Args:
+            xml_contents: List of strings containing XML fragments
+
+        Returns:
+            List with one list of imported defusedxml.minidom.Node objects per fragment
+
+        Raises:
+            AssertionError: If any fragment contains no element nodes
+        """
         # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
+        root_elem = self._dom.documentElement
         namespaces = []
         if root_elem and root_elem.attributes:
             for i in range(root_elem.attributes.length):
@@ -332,16 +658,732 @@ class XMLEditor:
                     namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
 
         ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
+        fragments = "".join(
+            f"<fragment>{xml_content}</fragment>" for xml_content in xml_contents
+        )
+        wrapper = f"<root {ns_decl}>{fragments}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
+        imported_root = self._dom.importNode(fragment_doc.documentElement, deep=True)
+
+        results = []
+        for fragment in list(imported_root.childNodes):
+            nodes = list(fragment.childNodes)
+            for node in nodes:
+                fragment.removeChild(node)
+            elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
+            assert elements, "Fragment must contain at least one element"
+            results.append(nodes)
+        return results
+
+
+class LxmlXMLEditor(XMLEditor):
+    """
+    XMLEditor backed by an lxml tree instead of a minidom DOM.
+
+    Offers the same API as XMLEditor, but get_node and the insertion methods
+    return lxml elements, and only elements (never text nodes) are returned by
+    replace_node, insert_after, insert_before and append_to. Tag and attribute
+    names are still given in prefixed form ("w:p", "w:id") and resolved against
+    the document's namespace declarations. Line numbers come from lxml's
+    sourceline.
+
+    Parsing keeps the defusedxml guarantees: entity declarations are rejected
+    with defusedxml.EntitiesForbidden, and entities, DTDs and network access are
+    never resolved.
+
+    Usually created with XMLEditor(xml_path, engine="lxml").
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        dom: Parsed lxml.etree._ElementTree
+        modified: True once the tree has been changed and not saved since
+    """
+
+    def __init__(self, xml_path, engine="lxml", cache_dir=None):
+        """
+        Initialize with path to XML file and parse it with lxml.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+            engine: Must be "lxml"
+            cache_dir: Accepted for compatibility with XMLEditor and ignored;
+                lxml parses faster than a cached tree could be rebuilt
+
+        Raises:
+            ValueError: If the XML file does not exist or the engine is not "lxml"
+            defusedxml.EntitiesForbidden: If the file declares entities
+        """
+        if engine != "lxml":
+            raise ValueError(f"Unsupported engine for {type(self).__name__}: {engine}")
+
+        self.xml_path = Path(xml_path)
+        if not self.xml_path.exists():
+            raise ValueError(f"XML file not found: {xml_path}")
+        # Parts unpacked with pretty="lazy" are pretty-printed on first open
+        _pretty_print_if_pending(self.xml_path)
+
+        with open(self.xml_path, "rb") as f:
+            header = f.read(200).decode("utf-8", errors="ignore")
+        self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+
+        self._dom = lxml.etree.parse(str(self.xml_path), _create_safe_lxml_parser())
+        _check_lxml_entities(self._dom)
+
+        # Prefix -> namespace map of the root, used to resolve "w:id" style names
+        self._nsmap = self._dom.getroot().nsmap
+
+        # Lookup index for get_node, built on first use
+        self._index = None
+        self.modified = False
+        self._exposed = False
+
+    def replace_node(self, elem, new_content):
+        """
+        Replace an element with new XML content.
+
+        Args:
+            elem: lxml element to replace
+            new_content: String containing XML to replace the node with
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements
+        """
+        parent = elem.getparent()
+        index = parent.index(elem)
+        tail = elem.tail
+        self.mark_modified()
+        self._unindex_node(elem)
+        parent.remove(elem)
+        nodes = self._insert_fragment(parent, index, new_content)
+        nodes[-1].tail = (nodes[-1].tail or "") + (tail or "")
+        self._index_nodes(nodes)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """
+        Insert XML content after an element.
+
+        Args:
+            elem: lxml element to insert after
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements
+        """
+        parent = elem.getparent()
+        # Keep the text that followed elem after the inserted content, as minidom does
+        tail, elem.tail = elem.tail, None
+        self.mark_modified()
+        nodes = self._insert_fragment(parent, parent.index(elem) + 1, xml_content)
+        nodes[-1].tail = (nodes[-1].tail or "") + (tail or "")
+        self._index_nodes(nodes)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        """
+        Insert XML content before an element.
+
+        Args:
+            elem: lxml element to insert before
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements
+        """
+        parent = elem.getparent()
+        self.mark_modified()
+        nodes = self._insert_fragment(parent, parent.index(elem), xml_content)
+        self._index_nodes(nodes)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """
+        Append XML content as children of an element.
+
+        Args:
+            elem: lxml element to append to
+            xml_content: String containing XML to append
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements
+        """
+        self.mark_modified()
+        nodes = self._insert_fragment(elem, len(elem), xml_content)
+        self._index_nodes(nodes)
+        return nodes
+
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        max_id = 0
+        for rel_elem in self._iter_elements(self._dom.getroot()):
+            if self._get_tag(rel_elem) != "Relationship":
+                continue
+            rel_id = rel_elem.get("Id", "")
+            if rel_id.startswith("rId"):
+                try:
+                    max_id = max(max_id, int(rel_id[3:]))
+                except ValueError:
+                    pass
+        return f"rId{max_id + 1}"
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Serializes the tree and writes it back to the original file path,
+        preserving the original encoding (ascii or utf-8). Like XMLEditor.save,
+        the file is replaced atomically.
+        """
+        with _atomic_write(self.xml_path) as f:
+            self._serialize(f)
+        self.modified = False
+
+    def _serialize(self, f):
+        """Write the serialized tree to a binary file object."""
+        # Same declaration as minidom's toxml, so the encoding is re-detected on reload
+        f.write(f'<?xml version="1.0" encoding="{self.encoding}"?>'.encode())
+        self._dom.write(f, encoding=self.encoding, xml_declaration=False)
+
+    def _insert_fragment(self, parent, index, xml_content):
+        """
+        Parse an XML fragment and insert its nodes into parent at a child index.
+
+        Text before the first element of the fragment is kept in front of it by
+        appending it to the preceding sibling's tail (or the parent's text).
+
+        Returns:
+            List of inserted lxml elements (including comments, if any)
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        if text:
+            if index == 0:
+                parent.text = (parent.text or "") + text
+            else:
+                previous = parent[index - 1]
+                previous.tail = (previous.tail or "") + text
+        for offset, node in enumerate(nodes):
+            parent.insert(index + offset, node)
         return nodes
 
+    def _parse_fragment(self, xml_content):
+        """
+        Parse XML fragment using the root element's namespace declarations.
+
+        Args:
+            xml_content: String containing XML fragment
+
+        Returns:
+            tuple: (leading_text, nodes) where leading_text is the text before the
+            first node and nodes are the fragment's top-level lxml nodes
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        ns_decl = " ".join(
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self._nsmap.items()
+        )
+        wrapper = f"<root {ns_decl}>{xml_content}</root>"
+        fragment_root = lxml.etree.fromstring(wrapper, _create_safe_lxml_parser())
+        _check_lxml_entities(fragment_root.getroottree())
+
+        nodes = list(fragment_root)
+        elements = [n for n in nodes if isinstance(n.tag, str)]
+        assert elements, "Fragment must contain at least one element"
+        # New content has no line in the original file; lxml reads 0 as unknown
+        for node in nodes:
+            for elem in self._iter_elements(node):
+                elem.sourceline = 0
+        return fragment_root.text, nodes
+
+    def _is_attached(self, node):
+        """Check whether a node is still part of this editor's document."""
+        parent = node.getparent()
+        while parent is not None:
+            node, parent = parent, parent.getparent()
+        return node is self._dom.getroot()
+
+    def _get_root(self):
+        """Get the root element of the document."""
+        return self._dom.getroot()
+
+    def _get_parent_element(self, node):
+        """Get the parent element of a node, or None at the root or when detached."""
+        return node.getparent()
+
+    def _iter_elements(self, node):
+        """Return a node and its descendant elements, or nothing for non-element nodes."""
+        if not isinstance(node.tag, str):
+            return []
+        return list(node.iter(tag=lxml.etree.Element))
+
+    def _get_tag(self, elem):
+        """Get the qualified tag name of an element as written in the file (e.g. "w:p")."""
+        local_name = elem.tag.rpartition("}")[2]
+        return f"{elem.prefix}:{local_name}" if elem.prefix else local_name
+
+    def _get_attribute(self, elem, attr_name):
+        """Get an attribute by qualified name, or "" if it is not set."""
+        prefix, _, local_name = attr_name.rpartition(":")
+        if not prefix:
+            return elem.get(attr_name, "")
+        if prefix == "xmlns":
+            return elem.nsmap.get(local_name, "")
+        if prefix == "xml":
+            return elem.get(f"{{{_XML_NAMESPACE}}}{local_name}", "")
+        uri = self._nsmap.get(prefix) or elem.nsmap.get(prefix)
+        if uri is None:
+            return ""
+        return elem.get(f"{{{uri}}}{local_name}", "")
+
+    def _get_line(self, elem):
+        """Get the line an element started on in the original file, or None for new nodes."""
+        return elem.sourceline or None
+
+    def _get_element_text(self, elem):
+        """
+        Recursively extract all text content from an element.
+
+        Skips text that contains only whitespace, like the minidom version, and
+        ignores the content of comments and processing instructions.
+
+        Args:
+            elem: lxml element to extract text from
+
+        Returns:
+            str: Concatenated text from all non-whitespace text within the element
+        """
+        text_parts = []
+        if elem.text and elem.text.strip():
+            text_parts.append(elem.text)
+        for child in elem:
+            if isinstance(child.tag, str):
+                text_parts.append(self._get_element_text(child))
+            if child.tail and child.tail.strip():
+                text_parts.append(child.tail)
+        return "".join(text_parts)
+
+
+class _NodeIndex:
+    """
+    Lookup tables over the elements of a DOM tree, used by XMLEditor.get_node.
+
+    Elements are indexed by tag name up front. Indexes by attribute value and by
+    source line are built per tag on first use. Attribute buckets are keyed by
+    the editor's _get_attribute() values, so elements missing an attribute are
+    filed under "". Tree access goes through the editor, so the same index
+    serves both engines.
+
+    Element text is cached on first use and dropped for the affected subtree
+    and its ancestors whenever nodes are added or removed, so untouched parts
+    of the tree keep their cached text. The optional trigram index maps each three-character
+    substring to the elements whose text contains it; elements whose text was
+    dropped are kept aside and re-indexed on the next query.
+
+    Entries are never invalidated in place: an element whose attribute changed
+    or that was detached may linger in a bucket, so callers must re-check every
+    candidate against the live tree.
+    """
+
+    def __init__(self, editor, by_tag=None):
+        self._editor = editor
+        self._by_tag = {}
+        self._by_attr = {}  # tag -> attribute name -> value -> elements
+        self._by_line = {}  # tag -> (sorted line numbers, elements in same order)
+        self._text = {}  # element -> text from editor._get_element_text
+        self._ngrams = {}  # tag -> (trigram -> elements, elements awaiting indexing)
+        if by_tag is not None:
+            # Tag buckets collected while the tree was built, in document order
+            self._by_tag = by_tag
+        else:
+            self.add([editor._get_root()])
+
+    def with_tag(self, tag):
+        """Return all indexed elements with the given tag."""
+        return list(self._by_tag.get(tag, ()))
+
+    def with_attr(self, tag, attr_name, attr_value):
+        """Return indexed elements with the given tag and attribute value."""
+        tag_attrs = self._by_attr.setdefault(tag, {})
+        if attr_name not in tag_attrs:
+            values = tag_attrs[attr_name] = {}
+            for elem in self._by_tag.get(tag, ()):
+                values.setdefault(self._editor._get_attribute(elem, attr_name), {})[
+                    elem
+                ] = None
+        return list(tag_attrs[attr_name].get(attr_value, ()))
+
+    def in_lines(self, tag, first_line, last_line):
+        """Return parsed elements with the given tag starting within the line span."""
+        if tag not in self._by_line:
+            lines_by_elem = (
+                (self._editor._get_line(elem), elem) for elem in self._by_tag.get(tag, ())
+            )
+            positioned = sorted(
+                ((line, elem) for line, elem in lines_by_elem if line is not None),
+                key=lambda item: item[0],
+            )
+            self._by_line[tag] = (
+                [line for line, _ in positioned],
+                [elem for _, elem in positioned],
+            )
+        lines, elems = self._by_line[tag]
+        return elems[bisect_left(lines, first_line) : bisect_right(lines, last_line)]
+
+    def text_of(self, elem):
+        """Return the text of an element, computing and caching it on first use."""
+        text = self._text.get(elem)
+        if text is None:
+            text = self._text[elem] = self._editor._get_element_text(elem)
+        return text
+
+    def refresh_text(self, elem):
+        """Return the live text of an element, updating the cached text if it changed."""
+        text = self._editor._get_element_text(elem)
+        if self._text.get(elem) != text:
+            self._forget_text(elem)
+            self._text[elem] = text
+        return text
+
+    def containing(self, tag, text):
+        """Return indexed elements with the given tag whose text has every trigram of text."""
+        needle_grams = _trigrams(text)
+        if not needle_grams:
+            return self.with_tag(tag)
+
+        if tag not in self._ngrams:
+            self._ngrams[tag] = ({}, dict.fromkeys(self._by_tag.get(tag, ())))
+        postings, pending = self._ngrams[tag]
+        for elem in pending:
+            for gram in _trigrams(self.text_of(elem)):
+                postings.setdefault(gram, {})[elem] = None
+        pending.clear()
+
+        buckets = sorted((postings.get(gram, {}) for gram in needle_grams), key=len)
+        return [
+            elem
+            for elem in buckets[0]
+            if all(elem in bucket for bucket in buckets[1:])
+        ]
+
+    def add(self, nodes):
+        """Index element nodes and all of their descendant elements."""
+        editor = self._editor
+        for node in nodes:
+            # Text of the enclosing elements now includes the new content
+            parent = editor._get_parent_element(node)
+            while parent is not None:
+                self._forget_text(parent)
+                parent = editor._get_parent_element(parent)
+
+            for elem in editor._iter_elements(node):
+                tag = editor._get_tag(elem)
+                self._forget_text(elem, tag)
+                self._by_tag.setdefault(tag, {})[elem] = None
+                # Only attribute indexes that already exist need updating;
+                # inserted nodes have no source line, so line indexes never do
+                for attr_name, values in self._by_attr.get(tag, {}).items():
+                    values.setdefault(editor._get_attribute(elem, attr_name), {})[
+                        elem
+                    ] = None
+
+    def remove(self, node):
+        """Drop an element node and its descendants from the tag and attribute indexes.
+
+        The node must still be attached: the enclosing elements lose its text, so
+        their cached text is dropped as well.
+        """
+        editor = self._editor
+        parent = editor._get_parent_element(node)
+        while parent is not None:
+            self._forget_text(parent)
+            parent = editor._get_parent_element(parent)
+
+        for elem in editor._iter_elements(node):
+            tag = editor._get_tag(elem)
+            self._forget_text(elem, tag, reindex=False)
+            self._by_tag.get(tag, {}).pop(elem, None)
+            for attr_name, values in self._by_attr.get(tag, {}).items():
+                values.get(editor._get_attribute(elem, attr_name), {}).pop(elem, None)
+
+    def _forget_text(self, elem, tag=None, reindex=True):
+        """Drop the cached text of an element and its trigram postings.
+
+        With reindex, the element is queued to be re-indexed by the next
+        containing() call for its tag.
+        """
+        old_text = self._text.pop(elem, None)
+        ngrams = self._ngrams.get(tag or self._editor._get_tag(elem))
+        if ngrams is None:
+            return
+        postings, pending = ngrams
+        if old_text is not None and elem not in pending:
+            for gram in _trigrams(old_text):
+                postings.get(gram, {}).pop(elem, None)
+        if reindex:
+            pending[elem] = None
+        else:
+            pending.pop(elem, None)
+
+
+def _parse_cache_path(cache_dir, content):
+    """Get the parse cache file for XML content.
+
+    The key covers the content, the entry layout and the full Python version,
+    since marshal data is only guaranteed to load on the version that wrote it.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{_PARSE_CACHE_VERSION}:{tuple(sys.version_info)}:".encode())
+    digest.update(content)
+    return Path(cache_dir) / f"{digest.hexdigest()}.dom"
+
+
+def _store_cached_dom(cache_path, dom):
+    """
+    Write a minidom tree to the parse cache as a flat list of node records.
+
+    Records are tuples in document order, each starting with the index of the
+    parent record (-1 for the document) and the node type:
+        (parent, ELEMENT_NODE, tagName, namespaceURI, prefix, localName,
+         ((name, namespaceURI, localName, prefix, value), ...), parse_position)
+        (parent, TEXT_NODE or COMMENT_NODE, data)
+        (parent, PROCESSING_INSTRUCTION_NODE, target, data)
+    The flat layout avoids recursion on wide or deep trees.
+    """
+    records = []
+    stack = [(node, -1) for node in reversed(dom.childNodes)]
+    while stack:
+        node, parent = stack.pop()
+        if node.nodeType == node.ELEMENT_NODE:
+            attrs = tuple(
+                (attr.name, attr.namespaceURI, attr.localName, attr.prefix, attr.value)
+                for attr in node.attributes.values()
+            )
+            position = getattr(node, "parse_position", None)
+            stack.extend((child, len(records)) for child in reversed(node.childNodes))
+            records.append(
+                (
+                    parent,
+                    node.nodeType,
+                    node.tagName,
+                    node.namespaceURI,
+                    node.prefix,
+                    node.localName,
+                    attrs,
+                    position,
+                )
+            )
+        elif node.nodeType == node.PROCESSING_INSTRUCTION_NODE:
+            records.append((parent, node.nodeType, node.target, node.data))
+        elif node.nodeType in (node.TEXT_NODE, node.COMMENT_NODE):
+            records.append((parent, node.nodeType, node.data))
+        else:
+            # Document types and other rare nodes are not cached
+            return
+
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    with _atomic_write(cache_path) as f:
+        f.write(marshal.dumps(records))
+    _evict_parse_cache(Path(cache_path).parent)
+
+
+def _evict_parse_cache(cache_dir):
+    """Delete the least recently used entries until the cache fits PARSE_CACHE_MAX_BYTES."""
+    entries = []
+    for entry in Path(cache_dir).glob("*.dom"):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue  # Removed by another process meanwhile
+        entries.append((stat.st_mtime_ns, stat.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries, key=lambda item: item[0]):
+        if total <= PARSE_CACHE_MAX_BYTES:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+
+
+def _load_cached_dom(cache_path):
+    """
+    Rebuild a minidom tree from the parse cache.
+
+    Nodes are built with the public DOM API only, so the rebuild does not
+    depend on minidom internals. A hit marks the entry as recently used.
+
+    Returns:
+        tuple: (document, tag index as tag -> {element: None}) or None if the
+        entry is missing or unreadable
+    """
+    try:
+        # loads() on the whole entry is much faster than load() on the file
+        records = marshal.loads(Path(cache_path).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    dom = xml.dom.minidom.Document()
+    nodes = []
+    by_tag = {}
+    # The rebuild only allocates live nodes, so collections during it would just
+    # rescan the growing tree over and over
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for record in records:
+            parent = dom if record[0] < 0 else nodes[record[0]]
+            node_type = record[1]
+            if node_type == dom.TEXT_NODE:
+                node = dom.createTextNode(record[2])
+            elif node_type == dom.ELEMENT_NODE:
+                _, _, tag, uri, _, _, attrs, position = record
+                node = dom.createElementNS(uri, tag)
+                for name, attr_uri, _, _, value in attrs:
+                    attr = dom.createAttributeNS(attr_uri, name)
+                    attr.value = value
+                    node.setAttributeNodeNS(attr)
+                if position is not None:
+                    node.parse_position = position
+                if tag in by_tag:
+                    by_tag[tag][node] = None
+                else:
+                    by_tag[tag] = {node: None}
+            elif node_type == dom.COMMENT_NODE:
+                node = dom.createComment(record[2])
+            else:
+                node = dom.createProcessingInstruction(record[2], record[3])
+            parent.appendChild(node)
+            nodes.append(node)
+    except (IndexError, TypeError, ValueError, xml.dom.DOMException):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if dom.documentElement is None:
+        return None
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass  # Read-only cache; the entry just ages
+    return dom, by_tag
+
+
+def _pretty_print_if_pending(xml_path):
+    """Pretty-print a part that unpack_document extracted with pretty="lazy".
+
+    unpack.py lists such parts in PENDING_PARTS_FILE at the top of the unpacked
+    directory, so this looks for it in the part's directories: one stat each
+    when there is none.
+    """
+    xml_path = xml_path.resolve()
+    for directory in xml_path.parents:
+        if (directory / PENDING_PARTS_FILE).is_file():
+            # Only needed for lazily unpacked directories
+            from ooxml.scripts.unpack import pretty_print_pending
+
+            pretty_print_pending(directory, [xml_path.relative_to(directory)])
+            return
+
+
+@contextmanager
+def _atomic_write(path):
+    """
+    Open a temporary binary file that replaces path when the block exits cleanly.
+
+    The temporary file lives in the same directory so the final rename is atomic,
+    gets the permissions of the file it replaces (or the umask default for a new
+    file), and is synced to disk before the rename. If the block raises, the
+    temporary file is removed and path is left untouched. Its name ends in
+    PARTIAL_SUFFIX, so one left behind by a crash is never packed.
+    """
+    path = Path(path)
+    while True:
+        token = secrets.token_hex(4)
+        temp_name = path.with_name(f".{path.name}.{token}{PARTIAL_SUFFIX}")
+        try:
+            fd = os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(temp_name, path.stat().st_mode & 0o7777)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+class _HashingWriter(io.RawIOBase):
+    """Binary file object that only hashes what is written to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.hash = hashlib.blake2b()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.hash.update(data)
+        return len(data)
+
+
+def _file_digest(path):
+    """Hash a file like _HashingWriter, or return None if it does not exist."""
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.digest()
+
+
+def _trigrams(text):
+    """Return the set of three-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+_XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def _create_safe_lxml_parser():
+    """
+    Create an lxml parser that never resolves entities, loads DTDs or uses the network.
+
+    Returns:
+        lxml.etree.XMLParser: Configured parser
+    """
+    return lxml.etree.XMLParser(
+        resolve_entities=False, load_dtd=False, no_network=True, huge_tree=False
+    )
+
+
+def _check_lxml_entities(tree):
+    """
+    Reject documents that declare entities, matching defusedxml's default policy.
+
+    Args:
+        tree: Parsed lxml.etree._ElementTree
+
+    Raises:
+        defusedxml.EntitiesForbidden: If the internal DTD declares an entity
+    """
+    dtd = tree.docinfo.internalDTD
+    if dtd is None:
+        return
+    for entity in dtd.iterentities():
+        raise defusedxml.EntitiesForbidden(
+            entity.name, entity.content, None, None, None, None
+        )
+
 
 def _create_line_tracking_parser():
     """